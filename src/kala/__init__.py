@@ -3,6 +3,7 @@
 import kala.models.shocks as shocks
 from kala.models import (
     AgentPlacementNetX,
+    CSRGraph,
     GamePlan,
     GameState,
     MatchingStrategy,
@@ -12,11 +13,13 @@ from kala.models import (
 from kala.models.game import play_game
 from kala.utils import (
     NetzDatabase,
+    get_concentration_coefficient,
     get_gini_coefficient,
     get_saver_agents,
     get_summed_score,
     init_saver_agent,
     init_savers_gamestate_from_netz,
+    run_ensemble,
 )
 
 
@@ -29,13 +32,16 @@ __all__ = [
     "GameState",
     "GamePlan",
     "AgentPlacementNetX",
+    "CSRGraph",
     # Utility functions
     "play_game",
     "get_summed_score",
     "get_saver_agents",
     "get_gini_coefficient",
+    "get_concentration_coefficient",
     "init_saver_agent",
     "init_savers_gamestate_from_netz",
+    "run_ensemble",
     # Shocks
     "shocks",
     # Memory
@@ -3,7 +3,7 @@
 from kala.models.agents import SaverAgent
 from kala.models.data import SaverProperties, SaverTraits  # noqa: F401
 from kala.models.game import GamePlan, GameState
-from kala.models.graphs import AgentPlacementNetX
+from kala.models.graphs import AgentPlacementNetX, CSRGraph
 from kala.models.memory import SaverFlipAfterFractionLost
 from kala.models.shocks import AddRandomEdge, RemoveRandomEdge, RemoveRandomPlayer, SwapRandomEdge
 from kala.models.strategies import MatchingStrategy, SaverCooperationPayoffStrategy
@@ -15,6 +15,7 @@ __all__ = [
     "GameState",
     "GamePlan",
     "AgentPlacementNetX",
+    "CSRGraph",
     "SaverCooperationPayoffStrategy",
     "MatchingStrategy",
     # Common shocks
@@ -1,5 +1,6 @@
 """Module defining the agents"""
 
+from collections import deque
 from typing import Generic, Protocol
 from uuid import UUID, uuid4
 
@@ -33,6 +34,8 @@ class Agent(Generic[Traits, Properties], Protocol):
 
     """
 
+    __slots__ = ()
+
     uuid: UUID
     traits: Traits
     properties: Properties
@@ -76,10 +79,13 @@ class SaverAgent(Agent[SaverTraits, SaverProperties]):
 
     """
 
+    # Many agents are created in a game so they don't carry a __dict__
+    __slots__ = ("uuid", "traits", "properties", "score", "memory", "update_rule")
+
     uuid: UUID
     traits: SaverTraits
     properties: SaverProperties
-    score: float = 0
+    score: float
 
     memory: CappedMemory
     update_rule: UpdateRule[SaverProperties] | None
@@ -88,7 +94,7 @@ class SaverAgent(Agent[SaverTraits, SaverProperties]):
         self,
         traits: SaverTraits,
         properties: SaverProperties,
-        memory: CappedMemory,
+        memory: CappedMemory | deque[MemoryItem],
         score: float = 0,
         uuid: UUID | None = None,
         update_rule: UpdateRule | None = None,
@@ -97,11 +103,14 @@ class SaverAgent(Agent[SaverTraits, SaverProperties]):
         self.uuid = uuid or uuid4()
         self.traits = traits
         self.properties = properties
+        # a plain deque (with a maxlen) is converted so that the losses are counted as they happen
+        if not isinstance(memory, CappedMemory):
+            memory = CappedMemory(memory, maxlen=memory.maxlen)
         self.memory = memory
         self.update_rule = update_rule
 
     def __hash__(self):
-        return hash(self.uuid)
+        return hash(self.uuid.int)  # same as hash(self.uuid) without a Python-level call
 
     def update(
         self,
@@ -133,6 +142,11 @@ class SaverAgent(Agent[SaverTraits, SaverProperties]):
         if not self.update_rule:
             return None
 
+        if getattr(self.update_rule, "needs_full_memory", False) and (
+            len(self.memory) != self.memory.maxlen
+        ):
+            return None
+
         # properties are passed as shallow copies so the code below updates properties
         # even without the need of a new assignment
         # NB: when the properties need to be changed this will also reset the memory
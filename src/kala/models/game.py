@@ -1,15 +1,47 @@
 """Module defining the top-level classes of games that put everything together."""
 
-from typing import Generator, Generic, Mapping, Protocol, Sequence
+import copy
+from typing import Generator, Generic, Iterable, Mapping, Protocol, Sequence
 
 import networkx as nx
+import numpy as np
 
 from kala.models.agents import Agent
 from kala.models.data import Properties, Traits
-from kala.models.graphs import AgentPlacement
+from kala.models.graphs import AgentPlacement, NodeID
 from kala.models.strategies import MatchingStrategy, PayoffStrategy
 
 
+class ScoreAccumulator:
+    """
+    Running totals of the agents' scores, kept up to date as payoffs are added.
+
+    Attributes
+    ----------
+    total : float
+        The sum of the scores S = sum_i x_i.
+    total_sq : float
+        The sum of the squared scores sum_i x_i^2.
+
+    """
+
+    total: float
+    total_sq: float
+
+    def __init__(self, agents: Sequence[Agent] = ()):
+        self.reset(agents)
+
+    def reset(self, agents: Sequence[Agent]) -> None:
+        """Recompute the totals from scratch (needed after agents are added or removed)."""
+        self.total = sum(a.score for a in agents)
+        self.total_sq = sum(a.score * a.score for a in agents)
+
+    def update(self, old_scores: np.ndarray, new_scores: np.ndarray) -> None:
+        """Account for the scores of some agents changing from `old_scores` to `new_scores`."""
+        self.total += float(new_scores.sum() - old_scores.sum())
+        self.total_sq += float(new_scores @ new_scores - old_scores @ old_scores)
+
+
 class GameState(Generic[Traits, Properties]):
     graph: nx.Graph
     agents: list[Agent[Traits, Properties]]
@@ -17,6 +49,11 @@ class GameState(Generic[Traits, Properties]):
     payoff_strategy: PayoffStrategy[Traits, Properties]
     matching_strategy: MatchingStrategy[Traits, Properties]
 
+    # Derived data kept in sync with `agents`, see `refresh()`
+    score_acc: ScoreAccumulator
+    scores: np.ndarray  # scores[i] == agents[i].score
+    _index: dict[int, int]  # agent.uuid.int -> i
+
     def __init__(
         self,
         graph: nx.Graph,
@@ -30,10 +67,96 @@ class GameState(Generic[Traits, Properties]):
         self.placements = placements
         self.payoff_strategy = payoff_strategy
         self.matching_strategy = matching_strategy
+        self.score_acc = ScoreAccumulator()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rebuild the data derived from `agents` (needed after agents are added or removed)."""
+        self.score_acc.reset(self.agents)
+        self.scores = np.fromiter(
+            (a.score for a in self.agents), dtype=np.float64, count=len(self.agents)
+        )
+        self._index = {a.uuid.int: i for i, a in enumerate(self.agents)}
+
+    def add_agent(self, agent: Agent[Traits, Properties], position: NodeID | None = None) -> None:
+        """
+        Add an agent to the list of agents and keep the derived data in sync.
+
+        The agent is also placed at `position` when it is given (the placements raise a
+        ValueError if the node is not empty, in which case the agent is not added).
+        """
+        if position is not None:
+            self.placements.add_agent(agent, position)
+
+        self.agents.append(agent)
+        self.refresh()
+
+    def remove_agent(self, agent: Agent[Traits, Properties]) -> bool:
+        """
+        Remove an agent from the list of agents and keep the derived data in sync.
+
+        Returns False if the agent is not part of the game (NB: this does not clear its position
+        in `placements`).
+        """
+        i = self._index.get(agent.uuid.int)
+        if i is None:
+            return False
+
+        self.agents.pop(i)
+        self.refresh()
+        return True
+
+    def copy(self) -> "GameState[Traits, Properties]":
+        """A copy of the game that can be played independently (the strategies are shared)."""
+        memo = {
+            id(self.payoff_strategy): self.payoff_strategy,
+            id(self.matching_strategy): self.matching_strategy,
+        }
+        return copy.deepcopy(self, memo)
+
+    def add_payoffs(
+        self,
+        agents: Sequence[Agent[Traits, Properties]],
+        payoffs: Sequence[float] | np.ndarray,
+    ) -> None:
+        """
+        Record in the derived data the payoffs added to the agents' scores (in a single pass).
+
+        If `agents` were modified without `add_agent` or `remove_agent`, the derived data are
+        rebuilt from the agents' scores instead (these already include the payoffs).
+        """
+        if len(self._index) != len(self.agents):
+            self.refresh()
+            return
+
+        try:
+            idx = np.fromiter(
+                (self._index[a.uuid.int] for a in agents), dtype=np.intp, count=len(agents)
+            )
+        except KeyError:
+            self.refresh()
+            return
+        touched = np.unique(idx)  # an agent can play more than one match per step
+
+        old_scores = self.scores[touched]
+        np.add.at(self.scores, idx, payoffs)
+        self.score_acc.update(old_scores, self.scores[touched])
 
 
 # NB: this is placed here instead of shocks.py to avoid circular imports
 class Shock(Protocol):
+    """
+    A change to the game applied between steps.
+
+    Shocks that add or remove players should use `GameState.add_agent` and
+    `GameState.remove_agent`. Shocks that change the edges of the graph must call
+    `placements.invalidate(*nodes)` with the nodes whose neighbours changed, since the placements
+    may cache the neighbours (rewiring an edge does not change the degree of the pivot node, so it
+    cannot be detected by the cache).
+    """
+
+    __slots__ = ()
+
     def apply(self, state: GameState[Traits, Properties]) -> GameState[Traits, Properties]:
         """Apply the shock to the game (this modifies the game in place)."""
 
@@ -77,11 +200,31 @@ def play_match(
 def play_step(time: int, state: GameState):
     """This function determines how a game step is played out."""
     matches = state.matching_strategy.select_matches(state.placements, state.graph)
-    updates = [payoff for agents in matches for payoff in play_match(agents, state.payoff_strategy)]
+    if not matches:
+        return
+
+    # The matches are played out in a single batch when the strategy implements it, otherwise
+    # one by one; see `play_match` for the outcome of each one
+    outcomes: Iterable[tuple[Agent, float, bool]]
+    if (calculate_payoffs := getattr(state.payoff_strategy, "calculate_payoffs", None)) is not None:
+        payoffs = calculate_payoffs(matches)
+        lost = payoffs < payoffs.max(axis=1, keepdims=True)
+        agents = [agent for match in matches for agent in match]
+        outcomes = zip(agents, payoffs.ravel().tolist(), lost.ravel().tolist())
+    else:
+        outcomes = (
+            outcome for match in matches for outcome in play_match(match, state.payoff_strategy)
+        )
+
     # For each agent, update its state based on the calculated payoff and
     # whether it received the minimum payoff in its match (lost_match).
-    for agent, payoff, lost_match in updates:
+    played, played_payoffs = [], []
+    for agent, payoff, lost_match in outcomes:
         agent.update(payoff=payoff, lost_match=lost_match, time=time)
+        played.append(agent)
+        played_payoffs.append(payoff)
+
+    state.add_payoffs(played, played_payoffs)
 
 
 # This function orchestrates the entire game, running it step by step until
@@ -97,10 +240,32 @@ def play_step(time: int, state: GameState):
 def play_game(
     state: GameState,
     game_plan: GamePlan,
+    yield_every: int = 1,
 ) -> Generator[tuple[int, GameState], None, None]:
     """
     Orchestate a full game.
+
+    Parameters
+    ----------
+    state : GameState
+        The initial state of the game (modified in place).
+    game_plan : GamePlan
+        The number of steps and the shocks to apply.
+    yield_every : int, optional
+        Yield the game state only every `yield_every` steps, after the steps where shocks were
+        applied and after the last step. By default 1 (every step is yielded).
+
+    Raises
+    ------
+    ValueError
+        If `yield_every` is not positive.
+
     """
+    if yield_every < 1:
+        raise ValueError("expected yield_every to be positive")
+
+    last = game_plan.steps - 1
+
     for time in range(game_plan.steps):
         shocks = game_plan.shocks.get(time, [])
 
@@ -109,4 +274,5 @@ def play_game(
 
         play_step(time, state)
 
-        yield time, state
+        if shocks or (time + 1) % yield_every == 0 or time == last:
+            yield time, state
@@ -1,7 +1,7 @@
 """Module defining the interface for the underlying graphs."""
 
 import warnings
-from typing import Generator, Hashable, MutableMapping, Protocol, Sequence
+from typing import Generator, Hashable, Iterable, Iterator, MutableMapping, Protocol, Sequence
 
 import networkx as nx
 import numpy as np
@@ -28,6 +28,25 @@ class AgentPlacement(Protocol):
     def get_agent(self, position: NodeID) -> Agent | None:
         """Get the agent (if any) located at the given position."""
 
+    def get_neighbours(self, position: NodeID, graph: nx.Graph) -> list[Agent]:
+        """
+        Get the agents located at the neighbours of the given position.
+
+        The list may be shared with later calls (e.g. cached) and must not be modified; use the
+        module-level `get_neighbours` for a copy. The default implementation looks the agents up
+        on each call.
+        """
+        agents = (self.get_agent(node) for node in graph.neighbors(position))
+        return [agent for agent in agents if agent is not None]
+
+    def invalidate(self, *positions: NodeID) -> None:
+        """
+        Signal that the edges of the given positions have changed.
+
+        Implementations that cache the neighbours must drop the cached neighbours of `positions`;
+        the default implementation does nothing.
+        """
+
     def __iter__(self) -> Generator[tuple[NodeID, Agent], None, None]: ...
 
 
@@ -38,34 +57,70 @@ class AgentPlacementNetX(AgentPlacement):
     It is assumed that nodes in the graph can remain empty, but only a single agent
     can be located at a particular node at any given moment.
 
+    The neighbours of each position are cached, which assumes that the placement is always used
+    with the same graph. The cache is updated when agents are added or removed and when the degree
+    of a position changes, but edges that are rewired without changing the degree of a position
+    (outside of the shocks) must be signalled by calling `invalidate`.
+
     """
 
     _mapping: MutableMapping[NodeID, Agent | None]
+    _positions: dict[int, NodeID]  # agent.uuid.int -> position (the reverse of _mapping)
+    _neighbours: dict[
+        NodeID, tuple[int, list[Agent]]
+    ]  # position -> (degree, agents at its neighbours)
+    _dependents: dict[NodeID, set[NodeID]]  # position -> positions it is a neighbour of
 
     def __init__(self):  # NB: needed (instead of attribute default) so we can define a classmethod
         self._mapping = {}
+        self._positions = {}
+        self._neighbours = {}
+        self._dependents = {}
 
     def clear_node(self, position: NodeID) -> NodeID | None:
         node = self._mapping.pop(position, None)
+        if node is not None and self._positions.get(node.uuid.int) == position:
+            del self._positions[node.uuid.int]
+        self._invalidate_dependents(position)
         return position if node else None
 
     def add_agent(self, agent: Agent, position: NodeID) -> None:
         if self._mapping.get(position) is None:
             self._mapping[position] = agent
+            self._positions.setdefault(agent.uuid.int, position)
+            self._invalidate_dependents(position)
         else:
             raise ValueError("node position is not empty")
 
     def get_position(self, agent: Agent) -> NodeID | None:
-        for k, v in self._mapping.items():
-            if v is None:
-                continue
-            elif agent.uuid == v.uuid:
-                return k
-        return None
+        return self._positions.get(agent.uuid.int)
 
     def get_agent(self, position: NodeID) -> Agent | None:
         return self._mapping.get(position, None)
 
+    def get_neighbours(self, position: NodeID, graph: nx.Graph) -> list[Agent]:
+        # NB: the cached list is returned so it should not be modified by the caller
+        degree = graph.degree(position)
+        if (cached := self._neighbours.get(position)) is not None and cached[0] == degree:
+            return cached[1]
+
+        neighbours = []
+        for node in graph.neighbors(position):
+            self._dependents.setdefault(node, set()).add(position)
+            if (neighbour := self._mapping.get(node)) is not None:
+                neighbours.append(neighbour)
+
+        self._neighbours[position] = (degree, neighbours)
+        return neighbours
+
+    def invalidate(self, *positions: NodeID) -> None:
+        for position in positions:
+            self._neighbours.pop(position, None)
+
+    def _invalidate_dependents(self, position: NodeID) -> None:
+        for dependent in self._dependents.pop(position, ()):
+            self._neighbours.pop(dependent, None)
+
     def __iter__(self) -> Generator[tuple[NodeID, Agent], None, None]:
         for k, v in self._mapping.items():
             if v is None:
@@ -88,6 +143,145 @@ class AgentPlacementNetX(AgentPlacement):
         return placement
 
 
+class CSRGraph:
+    """
+    An undirected graph stored as a compressed sparse row (CSR) adjacency array.
+
+    The nodes are the integers 0, ..., N-1 and the neighbours of node `i` are the contiguous slice
+    `indices[indptr[i] : indptr[i + 1]]`. The class implements the subset of the `networkx.Graph`
+    interface used by the strategies and shocks, so it can be used in place of a NetworkX graph.
+
+    Edge mutations are recorded in a set of edges (which also answers membership queries) and the
+    CSR arrays are rebuilt lazily on the next read, so a batch of shocks pays a single rebuild.
+
+    """
+
+    def __init__(self, num_nodes: int, edges: Iterable[tuple[int, int]] = ()):
+        self._num_nodes = num_nodes
+        self._edges: set[tuple[int, int]] = set()
+        for u, v in edges:
+            self._edges.add(self._edge_key(u, v))
+
+        self._indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.int64)
+        self._dirty = True
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph):
+        """
+        Initialise a new CSR graph from a NetworkX graph.
+
+        The nodes are relabelled 0, ..., N-1 following the iteration order of `graph` (which is
+        the identity for graphs read with `NetzDatabase`).
+        """
+        labels = {node: i for i, node in enumerate(graph)}
+        return cls(len(labels), ((labels[u], labels[v]) for u, v in graph.edges))
+
+    def _edge_key(self, u: int, v: int) -> tuple[int, int]:
+        if not (0 <= u < self._num_nodes and 0 <= v < self._num_nodes):
+            raise ValueError(f"edge ({u}, {v}) is not between nodes of the graph")
+        return (u, v) if u <= v else (v, u)
+
+    def _rebuild(self) -> None:
+        if not self._dirty:
+            return
+
+        edges = np.array(sorted(self._edges), dtype=np.int64).reshape(-1, 2)
+        not_loop = edges[:, 0] != edges[:, 1]
+        sources = np.concatenate((edges[:, 0], edges[not_loop, 1]))
+        targets = np.concatenate((edges[:, 1], edges[not_loop, 0]))
+
+        order = np.lexsort((targets, sources))
+        self._indices = targets[order]
+        self._indptr = np.zeros(self._num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=self._num_nodes), out=self._indptr[1:])
+        self._dirty = False
+
+    @property
+    def indptr(self) -> np.ndarray:
+        self._rebuild()
+        return self._indptr
+
+    @property
+    def indices(self) -> np.ndarray:
+        self._rebuild()
+        return self._indices
+
+    def neighbours(self, node: int) -> np.ndarray:
+        """Return the neighbours of a node as a slice of the CSR indices."""
+        self._rebuild()
+        return self._indices[self._indptr[node] : self._indptr[node + 1]]
+
+    neighbors = neighbours
+
+    def degree(self, node: int) -> int:
+        """Return the number of neighbours of a node."""
+        self._rebuild()
+        return int(self._indptr[node + 1] - self._indptr[node])
+
+    def has_edge(self, u: int, v: int) -> bool:
+        return self._edge_key(u, v) in self._edges
+
+    def add_edge(self, u: int, v: int) -> None:
+        self._edges.add(self._edge_key(u, v))
+        self._dirty = True
+
+    def remove_edge(self, u: int, v: int) -> None:
+        try:
+            self._edges.remove(self._edge_key(u, v))
+        except KeyError:
+            raise ValueError(f"edge ({u}, {v}) is not in the graph") from None
+        self._dirty = True
+
+    def is_connected(self) -> bool:
+        """
+        Check whether the graph is connected with a breadth-first search from node 0.
+
+        Each level of the search is expanded at once from the CSR arrays and the search stops as
+        soon as all the nodes have been reached.
+        """
+        if self._num_nodes == 0:
+            raise ValueError("connectivity is undefined for the null graph")
+
+        self._rebuild()
+        seen = np.zeros(self._num_nodes, dtype=bool)
+        seen[0] = True
+        num_seen = 1
+        frontier = np.zeros(1, dtype=np.int64)
+
+        while frontier.size and num_seen < self._num_nodes:
+            starts = self._indptr[frontier]
+            lengths = self._indptr[frontier + 1] - starts
+            # positions in `indices` of the neighbours of all the nodes in the frontier
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            neighbours = self._indices[offsets + np.arange(lengths.sum())]
+
+            frontier = np.unique(neighbours[~seen[neighbours]])
+            seen[frontier] = True
+            num_seen += frontier.size
+
+        return num_seen == self._num_nodes
+
+    def number_of_nodes(self) -> int:
+        return self._num_nodes
+
+    def number_of_edges(self) -> int:
+        return len(self._edges)
+
+    def __len__(self) -> int:
+        return self._num_nodes
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._num_nodes))
+
+    def __contains__(self, node: object) -> bool:
+        return isinstance(node, (int, np.integer)) and bool(0 <= node < self._num_nodes)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        # NB: needed so that the nodes can be sampled with `rng.choice(graph)`
+        return np.arange(self._num_nodes, dtype=dtype)
+
+
 def get_neighbours(
     agent: Agent,
     graph: nx.Graph,
@@ -103,17 +297,31 @@ def get_neighbours(
     if (position := placements.get_position(agent)) is None:
         return None
 
-    return [
-        neighbor
-        for node in graph.neighbors(position)
-        if (neighbor := placements.get_agent(node)) is not None
-    ]
+    # the placements may return a cached list, so the caller gets a copy it can modify
+    return list(_get_neighbours(placements, position, graph))
 
 
 get_neighbors = get_neighbours
 """Alias for get_neighbours"""
 
 
+# The methods below were added to the AgentPlacement protocol after its first release, so
+# placements that implement the protocol without subclassing it may not define them
+
+
+def _get_neighbours(placements: AgentPlacement, position: NodeID, graph: nx.Graph) -> list[Agent]:
+    """Call `placements.get_neighbours`, or the default implementation if it is missing."""
+    if (method := getattr(placements, "get_neighbours", None)) is not None:
+        return method(position, graph)
+    return AgentPlacement.get_neighbours(placements, position, graph)
+
+
+def _invalidate(placements: AgentPlacement, *positions: NodeID) -> None:
+    """Call `placements.invalidate` if it is defined."""
+    if (method := getattr(placements, "invalidate", None)) is not None:
+        method(*positions)
+
+
 def get_neighbour_sample_with_homophily(
     agent: SaverAgent,
     graph: nx.Graph,
@@ -1,5 +1,5 @@
 from collections import deque
-from typing import Generic, Protocol
+from typing import Generic, Iterable, Protocol
 
 from pydantic import BaseModel
 
@@ -25,14 +25,115 @@ class MemoryItem(BaseModel, Generic[Properties]):
 # Memory is simply a list of memory items
 Memory = list[MemoryItem[Properties]]
 
+
 # A finite list of memory items
-CappedMemory = deque[MemoryItem[Properties]]  # assumes maxlen attribute
+class CappedMemory(deque[MemoryItem]):
+    """
+    A deque of memory items (with a `maxlen`) that keeps count of the matches lost.
+
+    The outcomes are bit-packed into an integer (the newest item is the lowest bit), so that
+    appending an item and counting the losses are O(1) instead of a pass over the whole memory.
+
+    """
+
+    _lost_bits: int
+
+    def __init__(self, iterable: Iterable[MemoryItem] = (), maxlen: int | None = None):
+        super().__init__(iterable, maxlen)
+        self._recount()
+
+    @property
+    def num_lost(self) -> int:
+        """The number of matches lost in memory."""
+        return self._lost_bits.bit_count()
+
+    def _recount(self) -> None:
+        self._lost_bits = 0
+        for item in self:
+            self._lost_bits = (self._lost_bits << 1) | item.match_lost
+
+    def append(self, item: MemoryItem) -> None:
+        super().append(item)
+        self._lost_bits = (self._lost_bits << 1) | item.match_lost
+        if self.maxlen is not None:
+            self._lost_bits &= (1 << self.maxlen) - 1  # drop the evicted item (if any)
+
+    def clear(self) -> None:
+        super().clear()
+        self._lost_bits = 0
+
+    # The methods below are not used to record matches so the count is simply recomputed
+
+    def appendleft(self, item: MemoryItem) -> None:
+        super().appendleft(item)
+        self._recount()
+
+    def extend(self, items: Iterable[MemoryItem]) -> None:
+        super().extend(items)
+        self._recount()
+
+    def extendleft(self, items: Iterable[MemoryItem]) -> None:
+        super().extendleft(items)
+        self._recount()
+
+    def insert(self, i: int, item: MemoryItem) -> None:
+        super().insert(i, item)
+        self._recount()
+
+    def pop(self) -> MemoryItem:  # type: ignore[override]
+        item = super().pop()
+        self._recount()
+        return item
+
+    def popleft(self) -> MemoryItem:
+        item = super().popleft()
+        self._recount()
+        return item
+
+    def remove(self, item: MemoryItem) -> None:
+        super().remove(item)
+        self._recount()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._recount()
+
+    def rotate(self, n: int = 1) -> None:
+        super().rotate(n)
+        self._recount()
+
+    def __setitem__(self, i, item) -> None:
+        super().__setitem__(i, item)
+        self._recount()
+
+    def __delitem__(self, i) -> None:
+        super().__delitem__(i)
+        self._recount()
+
+    def __iadd__(self, items):  # type: ignore[misc]
+        super().__iadd__(items)
+        self._recount()
+        return self
+
+    def __imul__(self, n):  # type: ignore[misc]
+        super().__imul__(n)
+        self._recount()
+        return self
+
+    def __reduce__(self):
+        # rebuild from the items (deque would restore the count and then append the items again)
+        return type(self), (list(self), self.maxlen)
 
 
 # An agent can dynamically adapt its strategies, which are encoded in its
 # properties. This class defines how a strategy is updated based on the
 # agent's current properties  and memory.
 class UpdateRule(Generic[Properties_co], Protocol):
+    # Rules that only act once the memory is full set this flag so that the agent can skip
+    # calling them while the memory fills up (i.e. after the start and after every flip); it is
+    # optional, so rules that do not subclass the protocol are always called
+    needs_full_memory: bool = False
+
     def update(
         self,
         properties: Properties,
@@ -41,20 +142,25 @@ class UpdateRule(Generic[Properties_co], Protocol):
 
 
 class SaverFlipAfterFractionLost(UpdateRule[SaverProperties]):
+    needs_full_memory = True
+
     def __init__(self, frac: float) -> None:
         self.frac = frac
 
     def update(
         self,
         properties,  # passed as shallow copy
-        memory: CappedMemory,
+        memory: CappedMemory | deque[MemoryItem],
     ) -> None:
         memory_length = memory.maxlen
 
         if len(memory) != memory_length:
             return None
 
-        losses = sum(item.match_lost for item in memory)
+        if isinstance(memory, CappedMemory):
+            losses = memory.num_lost
+        else:
+            losses = sum(item.match_lost for item in memory)
 
         if (self.frac == 0 and losses > 0) or losses >= (memory_length * self.frac):
             properties.is_saver = not properties.is_saver
@@ -4,12 +4,15 @@ import numpy as np
 
 from kala.models.agents import Agent
 from kala.models.game import GameState, Shock
+from kala.models.graphs import NodeID, _invalidate
 from kala.settings import DEBUG
 
 
 class RemovePlayer(Shock):
     """Remove a specific player from the game."""
 
+    __slots__ = ("agent",)
+
     def __init__(self, agent: Agent):
         self.agent = agent
 
@@ -24,10 +27,7 @@ class RemovePlayer(Shock):
             print("removing player", self.agent.uuid)
 
         state.placements.clear_node(node)
-        for i, agent in enumerate(state.agents):
-            if agent.uuid == self.agent.uuid:
-                state.agents.pop(i)
-                break
+        state.remove_agent(self.agent)
 
         return state
 
@@ -35,9 +35,13 @@ class RemovePlayer(Shock):
 class RemoveRandomPlayer(Shock):
     """Remove a player selected at random from the game."""
 
+    __slots__ = ("rng",)
+
+    def __init__(self, rng: int | np.random.Generator | None = None):
+        self.rng = np.random.default_rng(rng)
+
     def apply(self, state: GameState) -> GameState:
-        rng = np.random.default_rng()
-        node = rng.choice(state.graph, size=1)[0]
+        node = self.rng.choice(state.graph, size=1)[0]
         agent = state.placements.get_agent(node)
 
         if agent is None:
@@ -49,10 +53,7 @@ class RemoveRandomPlayer(Shock):
             print("removing player", agent.uuid)
 
         state.placements.clear_node(node)
-        for i, a in enumerate(state.agents):
-            if a.uuid == agent.uuid:
-                state.agents.pop(i)
-                break
+        state.remove_agent(agent)
 
         return state
 
@@ -60,6 +61,8 @@ class RemoveRandomPlayer(Shock):
 class AddEdge(Shock):
     """Add an edge in the game."""
 
+    __slots__ = ("agent_u", "agent_v")
+
     def __init__(self, agent_u: Agent, agent_v: Agent):
         self.agent_u = agent_u
         self.agent_v = agent_v
@@ -77,33 +80,31 @@ class AddEdge(Shock):
             print(f"Adding edge: ({node_u}, {node_v})")
 
         state.graph.add_edge(node_u, node_v)
+        _invalidate(state.placements, node_u, node_v)
         return state
 
 
 class AddRandomEdge(Shock):
     """Add an edge selected at random from the game."""
 
-    def __init__(self, max_attempts: int = 10):
+    __slots__ = ("max_attempts", "rng")
+
+    def __init__(self, max_attempts: int = 10, rng: int | np.random.Generator | None = None):
         self.max_attempts = max_attempts
+        self.rng = np.random.default_rng(rng)
 
     def apply(self, state: GameState) -> GameState:
-        rng = np.random.default_rng()
-        node_u = rng.choice(list(state.graph), size=1)[0]
-        neighbors = list(state.graph.neighbors(node_u))
+        nodes = np.asarray(list(state.graph))
+        node_u = self.rng.choice(nodes)
+        neighbors = set(state.graph.neighbors(node_u))
 
-        node_v = node_u
-        attempts = 0
-        while node_v == node_u or node_v in neighbors:
-            if attempts == self.max_attempts:
-                node_v = None  # don't take any action
-                break
-            node_v = rng.choice(list(state.graph), size=1)[0]
-            attempts += 1
+        node_v = _draw_new_neighbour(self.rng, nodes, node_u, neighbors, self.max_attempts)
 
         if node_v is not None:
             if DEBUG:
                 print(f"Adding edge: ({node_u}, {node_v})")
             state.graph.add_edge(node_u, node_v)
+            _invalidate(state.placements, node_u, node_v)
 
         return state
 
@@ -111,6 +112,8 @@ class AddRandomEdge(Shock):
 class RemoveEdge(Shock):
     """Remove a specific edge from the game."""
 
+    __slots__ = ("agent_u", "agent_v")
+
     def __init__(self, agent_u: Agent, agent_v: Agent):
         self.agent_u = agent_u
         self.agent_v = agent_v
@@ -128,15 +131,20 @@ class RemoveEdge(Shock):
             print(f"removing edge ({node_u}, {node_v})")
 
         state.graph.remove_edge(node_u, node_v)
+        _invalidate(state.placements, node_u, node_v)
         return state
 
 
 class RemoveRandomEdge(Shock):
     """Remove an edge selected at random from the game."""
 
+    __slots__ = ("rng",)
+
+    def __init__(self, rng: int | np.random.Generator | None = None):
+        self.rng = np.random.default_rng(rng)
+
     def apply(self, state: GameState) -> GameState:
-        rng = np.random.default_rng()
-        node_u = rng.choice(state.graph, size=1)[0]
+        node_u = self.rng.choice(state.graph, size=1)[0]
         neighbors = list(state.graph.neighbors(node_u))
 
         if not neighbors:
@@ -144,18 +152,21 @@ class RemoveRandomEdge(Shock):
                 print("no neighbors found; passing")
             return state
 
-        node_v = rng.choice(neighbors, size=1)[0]
+        node_v = self.rng.choice(neighbors, size=1)[0]
 
         if DEBUG:
             print(f"removing edge ({node_u}, {node_v})")
 
         state.graph.remove_edge(node_u, node_v)
+        _invalidate(state.placements, node_u, node_v)
         return state
 
 
 class SwapEdge(Shock):
     """Swap an edge in the game."""
 
+    __slots__ = ("pivot_u", "agent_v", "agent_w")
+
     def __init__(self, pivot_u: Agent, agent_v: Agent, agent_w: Agent):
         self.pivot_u = pivot_u
         self.agent_v = agent_v
@@ -176,18 +187,22 @@ class SwapEdge(Shock):
 
         state.graph.remove_edge(node_u, node_v)
         state.graph.add_edge(node_u, node_w)
+        _invalidate(state.placements, node_u, node_v, node_w)
         return state
 
 
 class SwapRandomEdge(Shock):
     """Swap an edge selected at random from the game."""
 
-    def __init__(self, max_attempts: int = 10):
+    __slots__ = ("max_attempts", "rng")
+
+    def __init__(self, max_attempts: int = 10, rng: int | np.random.Generator | None = None):
         self.max_attempts = max_attempts
+        self.rng = np.random.default_rng(rng)
 
     def apply(self, state: GameState) -> GameState:
-        rng = np.random.default_rng()
-        node_u = rng.choice(state.graph, size=1)[0]
+        nodes = np.asarray(list(state.graph))
+        node_u = self.rng.choice(nodes)
         neighbors = list(state.graph.neighbors(node_u))
 
         if not neighbors:
@@ -195,21 +210,32 @@ class SwapRandomEdge(Shock):
                 print("no neighbors found; passing")
             return state
 
-        node_v = rng.choice(neighbors, size=1)[0]
-
-        node_w = node_u
-        attempts = 0
-        while node_w == node_u or node_w in neighbors:
-            if attempts == self.max_attempts:
-                node_w = None  # don't take any action
-                break
-            node_w = rng.choice(state.graph, size=1)[0]
-            attempts += 1
+        node_v = self.rng.choice(neighbors, size=1)[0]
+        node_w = _draw_new_neighbour(self.rng, nodes, node_u, set(neighbors), self.max_attempts)
 
         if node_w is not None:
             if DEBUG:
                 print(f"swapping edge: ({node_u}, {node_v}) -> ({node_u}, {node_w})")
             state.graph.remove_edge(node_u, node_v)
             state.graph.add_edge(node_u, node_w)
+            _invalidate(state.placements, node_u, node_v, node_w)
 
         return state
+
+
+def _draw_new_neighbour(
+    rng: np.random.Generator,
+    nodes: np.ndarray,
+    node_u: NodeID,
+    neighbors: set[NodeID],
+    max_attempts: int,
+) -> NodeID | None:
+    """
+    Draw a node that is neither `node_u` nor one of its neighbours, or None if no valid node was
+    found after `max_attempts` draws (which are made at once).
+    """
+    for node_v in rng.choice(nodes, size=max_attempts):
+        if node_v != node_u and node_v not in neighbors:
+            return node_v
+
+    return None  # don't take any action
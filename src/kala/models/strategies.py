@@ -1,39 +1,44 @@
 """Module defining agent strategies."""
 
-from typing import Callable, Generic, Protocol
+from types import MappingProxyType
+from typing import Callable, Generic, Mapping, Protocol
 
 import networkx as nx
 import numpy as np
 
 from kala.models.agents import Agent, SaverProperties, SaverTraits
 from kala.models.data import Properties, Traits
-from kala.models.graphs import AgentPlacement, get_neighbours
+from kala.models.graphs import AgentPlacement, _get_neighbours
 
 
 class MatchingStrategy(Generic[Traits, Properties]):
+    def __init__(self, rng: int | np.random.Generator | None = None):
+        self.rng = np.random.default_rng(rng)
+
     def select_matches(
         self,
         placements: AgentPlacement,
         graph: nx.Graph,
     ) -> list[list[Agent[Traits, Properties]]]:
-        rng = np.random.default_rng()
+        rng = self.rng
         num_nodes = graph.number_of_nodes()
         selection = rng.choice(graph, size=num_nodes // 2)
 
+        # the opponents are picked by indexing the (cached) lists of neighbours with one batch of
+        # uniform draws, instead of converting each list to an array with `rng.choice`
+        draws = rng.random(len(selection))
+
         out = []
 
-        for node in selection:
+        for node, draw in zip(selection.tolist(), draws.tolist()):
             if (agent := placements.get_agent(node)) is None:
                 continue
 
-            neighs = get_neighbours(agent, graph, placements)
-            if neighs is None or neighs == []:
+            neighs = _get_neighbours(placements, node, graph)
+            if not neighs:
                 continue
 
-            if (opponent := rng.choice(neighs)) is None:  # type: ignore
-                continue
-
-            out.append([agent, opponent])
+            out.append([agent, neighs[int(draw * len(neighs))]])
 
         return out
 
@@ -46,17 +51,27 @@ class PayoffStrategy(Generic[Traits, Properties], Protocol):
     ----------
     stochastic : bool, optional
         Whether to use a stochastic payoff matrix, by default True.
-    payoff_matrix : dict[tuple[str, str], tuple[float, float]]
+    payoff_matrix : Mapping[tuple[str, str], tuple[float, float]]
         A dictionary mapping types of agent traits to numerical payoffs.
 
     """
 
     stochastic: bool = True
-    payoff_matrix: dict[tuple[str, str], tuple[float, float]]
+    payoff_matrix: Mapping[tuple[str, str], tuple[float, float]]
 
     def calculate_payoff(self, agents: list[Agent[Traits, Properties]]) -> list[float]:
         """A realization of the payoff for a strategy."""
 
+    def calculate_payoffs(self, matches: list[list[Agent[Traits, Properties]]]) -> np.ndarray:
+        """
+        Realizations of the payoffs for a batch of matches (one row per match).
+
+        This method is optional (the game calls `calculate_payoff` for each match when it is
+        missing); the default implementation expects all matches to have the same size.
+        """
+        payoffs = [self.calculate_payoff(agents) for agents in matches]
+        return np.array(payoffs, dtype=np.float64)
+
 
 class SaverCooperationPayoffStrategy(PayoffStrategy[SaverTraits, SaverProperties]):
     """
@@ -106,13 +121,6 @@ class SaverCooperationPayoffStrategy(PayoffStrategy[SaverTraits, SaverProperties
         payoff_ss = 1 + differential_efficient
         payoff_sn = 1 - differential_inefficient
 
-        self.payoff_matrix = {
-            ("saver", "saver"): (payoff_ss, payoff_ss),
-            ("saver", "non-saver"): (payoff_sn, 1),
-            ("non-saver", "saver"): (1, payoff_sn),
-            ("non-saver", "non-saver"): (1, 1),
-        }
-
         self._saver_encoding = {True: "saver", False: "non-saver"}
         # used to map the trait is_saver to the payoff matrix entries
 
@@ -133,22 +141,95 @@ class SaverCooperationPayoffStrategy(PayoffStrategy[SaverTraits, SaverProperties
         # TODO: more elegant solution would be to accept initialized distribution that
         # doesn't need parameters and is ready to return random numbers
 
+        self._sigma_array = np.empty((2, 2))
+        for i in (0, 1):
+            for j in (0, 1):
+                self._sigma_array[i, j] = self._sigma[self._encode(i, j)]
+        self._sigma_table: list[list[float]] = self._sigma_array.tolist()
+
+        self.payoff_matrix = {
+            ("saver", "saver"): (payoff_ss, payoff_ss),
+            ("saver", "non-saver"): (payoff_sn, 1),
+            ("non-saver", "saver"): (1, payoff_sn),
+            ("non-saver", "non-saver"): (1, 1),
+        }
+
+    def _encode(self, i: int, j: int) -> tuple[str, str]:
+        return self._saver_encoding[bool(i)], self._saver_encoding[bool(j)]
+
+    @property
+    def payoff_matrix(self) -> Mapping[tuple[str, str], tuple[float, float]]:
+        """
+        The payoffs of each pair of types of agents.
+
+        The matrix is read-only because the payoffs are looked up in tables built from it; assign
+        a new matrix to change the payoffs.
+        """
+        return MappingProxyType(self._payoff_matrix)
+
+    @payoff_matrix.setter
+    def payoff_matrix(self, payoff_matrix: Mapping[tuple[str, str], tuple[float, float]]) -> None:
+        self._payoff_matrix = dict(payoff_matrix)
+
+        # The same table as an array indexed by [is_saver_i, is_saver_j] so that the payoffs are
+        # looked up without building string keys
+        self._payoff_array = np.empty((2, 2, 2))
+        for i in (0, 1):
+            for j in (0, 1):
+                self._payoff_array[i, j] = self._payoff_matrix[self._encode(i, j)]
+
+        # nested lists are faster than numpy arrays to index with scalars
+        self._payoff_table: list[list[list[float]]] = self._payoff_array.tolist()
+
     def calculate_payoff(self, agents: list[Agent[SaverTraits, SaverProperties]]) -> list[float]:
         """A realization of the payoff for a strategy."""
 
         if len(agents) != 2:
             raise ValueError("expected exactly two agents")
 
-        saver_traits: tuple[str, str] = tuple(
-            self._saver_encoding[ag.properties.is_saver] for ag in agents
-        )  # type: ignore
-        specs = np.asarray([ag.traits.min_specialization for ag in agents])
-        payoffs = np.asarray(self.payoff_matrix[saver_traits]) + specs
+        agent_i, agent_j = agents
+        i = int(agent_i.properties.is_saver)
+        j = int(agent_j.properties.is_saver)
+        # NB: the lookup and two additions are cheaper than a call to a memoised function
+        payoff_i, payoff_j = self._payoff_table[i][j]
+        payoffs = [
+            payoff_i + agent_i.traits.min_specialization,
+            payoff_j + agent_j.traits.min_specialization,
+        ]
 
-        if self.stochastic:
-            rng = np.random.default_rng()
-            draw = rng.lognormal(mean=0, sigma=self._sigma[saver_traits])
-            # below ignores the dummy draw for (non-saver, non-saver)
-            payoffs *= [draw if ag.properties.is_saver else 1 for ag in agents]
+        if not self.stochastic:
+            return payoffs
 
-        return payoffs
+        rng = np.random.default_rng()
+        draw = rng.lognormal(mean=0, sigma=self._sigma_table[i][j])
+        # below ignores the dummy draw for (non-saver, non-saver)
+        return [p * draw if ag.properties.is_saver else p for p, ag in zip(payoffs, agents)]
+
+    def calculate_payoffs(
+        self,
+        matches: list[list[Agent[SaverTraits, SaverProperties]]],
+    ) -> np.ndarray:
+        """Realizations of the payoffs for a batch of matches (one row per match)."""
+
+        if any(len(agents) != 2 for agents in matches):
+            raise ValueError("expected exactly two agents")
+
+        num_matches = len(matches)
+        agents = [ag for match in matches for ag in match]
+        is_saver = np.fromiter(
+            (ag.properties.is_saver for ag in agents), dtype=bool, count=2 * num_matches
+        ).reshape(num_matches, 2)
+        min_spec = np.fromiter(
+            (ag.traits.min_specialization for ag in agents), dtype=np.float64, count=2 * num_matches
+        ).reshape(num_matches, 2)
+
+        i, j = is_saver.astype(np.intp).T
+        payoffs = self._payoff_array[i, j] + min_spec
+
+        if not self.stochastic:
+            return payoffs
+
+        rng = np.random.default_rng()
+        draws = rng.lognormal(mean=0, sigma=self._sigma_array[i, j])
+        # below ignores the dummy draws for (non-saver, non-saver)
+        return np.where(is_saver, payoffs * draws[:, None], payoffs)
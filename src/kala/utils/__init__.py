@@ -1,6 +1,12 @@
 """Utility functions."""
 
-from kala.utils.game_stats import get_gini_coefficient, get_saver_agents, get_summed_score
+from kala.utils.ensemble import run_ensemble
+from kala.utils.game_stats import (
+    get_concentration_coefficient,
+    get_gini_coefficient,
+    get_saver_agents,
+    get_summed_score,
+)
 from kala.utils.io import NetzDatabase
 from kala.utils.wrappers import init_saver_agent, init_savers_gamestate_from_netz
 
@@ -10,6 +16,8 @@ __all__ = [
     "get_saver_agents",
     "get_summed_score",
     "get_gini_coefficient",
+    "get_concentration_coefficient",
     "init_savers_gamestate_from_netz",
     "init_saver_agent",
+    "run_ensemble",
 ]
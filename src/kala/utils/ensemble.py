@@ -0,0 +1,85 @@
+"""Run many independent realisations of a game in parallel."""
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Sequence
+
+import numpy as np
+
+from kala.models.game import GamePlan, GameState, play_game
+from kala.utils.game_stats import get_summed_score
+
+
+GameFactory = Callable[[int], tuple[GameState, GamePlan]]
+Statistic = Callable[[GameState], float]
+
+
+def _run_single(factory: GameFactory, statistic: Statistic, seed: int) -> np.ndarray:
+    """Build a game from a seed, play it and return the statistic at each step."""
+    state, game_plan = factory(seed)
+    out = np.full(game_plan.steps, np.nan)
+    for time, current in play_game(state, game_plan):
+        out[time] = statistic(current)
+    return out
+
+
+def run_ensemble(
+    factory: GameFactory,
+    seeds: Sequence[int],
+    statistic: Statistic = get_summed_score,
+    n_workers: int | None = None,
+) -> np.ndarray:
+    """
+    Play an independent game for each seed and record a statistic at each step.
+
+    The games are played in a pool of processes, so that only the factory (and not the game
+    state) is sent to the workers.
+
+    Parameters
+    ----------
+    factory : Callable[[int], tuple[GameState, GamePlan]]
+        A function that builds the initial state and the game plan from a seed. Each game needs
+        its own plan because the random shocks keep their own random generator. It must be
+        picklable (e.g. a function defined at the top level of a module) for the games to be
+        played in parallel.
+    seeds : Sequence[int]
+        The seeds passed to `factory`, one per game.
+    statistic : Callable[[GameState], float], optional
+        The statistic recorded at each step, by default `get_summed_score`.
+    n_workers : int | None, optional
+        The number of processes, by default None (the number of CPUs). When it is 1, or when
+        `factory` or `statistic` cannot be pickled, the games are played in the current process.
+
+    Returns
+    -------
+    np.ndarray
+        An array with shape (len(seeds), steps) where row i holds the statistic of the game
+        built from seeds[i] and steps is the largest number of steps of the game plans (the
+        steps that are not played, if any, are NaN). When `seeds` is empty no game is built, so
+        the number of steps is unknown and the shape is (0, 0).
+
+    """
+    run = partial(_run_single, factory, statistic)
+
+    try:
+        pickle.dumps(run)
+        parallel = n_workers != 1
+    except (pickle.PicklingError, AttributeError, TypeError):
+        parallel = False
+
+    if parallel:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(run, seeds))
+    else:
+        results = [run(seed) for seed in seeds]
+
+    if not results:
+        return np.empty((0, 0))
+
+    # the plans can have different numbers of steps, the shorter games are padded with NaN
+    out = np.full((len(results), max(len(r) for r in results)), np.nan)
+    for row, result in zip(out, results):
+        row[: len(result)] = result
+
+    return out
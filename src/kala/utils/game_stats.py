@@ -6,21 +6,33 @@ from kala.models import GameState, SaverProperties, SaverTraits
 from kala.models.agents import Agent
 
 
-def get_summed_score(agents: list[Agent]) -> float:
+ZERO_TOL = 1e-8  # a total score below this (in absolute value) is treated as zero, as np.isclose
+
+
+def _get_scores(agents: list[Agent] | GameState) -> np.ndarray:
+    """Get the scores as an array, reading the array kept by the game state if one is passed."""
+    if isinstance(agents, GameState):
+        return agents.scores
+
+    return np.fromiter((a.score for a in agents), dtype=np.float64, count=len(agents))
+
+
+def get_summed_score(agents: list[Agent] | GameState) -> float:
     """
     Get the sum of the scores of all agents in the game.
 
     Parameters
     ----------
-    agents : list[Agent]
-        The list of agents to get the summed score for.
+    agents : list[Agent] | GameState
+        The list of agents to get the summed score for. If a game state is passed, the scores of
+        all of its agents are summed without iterating over the agents.
 
     Returns
     -------
     float
 
     """
-    return sum(a.score for a in agents)
+    return float(_get_scores(agents).sum())
 
 
 def get_saver_agents(
@@ -43,28 +55,57 @@ def get_saver_agents(
     return [a for a in state.agents if a.properties.is_saver]
 
 
-def get_gini_coefficient(agents: list[Agent]) -> float:
+def get_gini_coefficient(agents: list[Agent] | GameState) -> float:
     """
     Calculate the Gini coefficient for the scores of a group of agents.
 
     Parameters
     ----------
-    agents : list[Agent]
-        The list of agents to calculate the Gini coefficient for.
+    agents : list[Agent] | GameState
+        The list of agents to calculate the Gini coefficient for. If a game state is passed, the
+        scores of all of its agents are used without iterating over the agents.
 
     Returns
     -------
     float
 
     """
-    savings = sorted(a.score for a in agents)
+    scores = np.sort(_get_scores(agents))
 
-    total_wealth = sum(savings)
-    if np.isclose(total_wealth, 0):
+    # the scores can be negative (e.g. with a negative min_specialization), so only a total that
+    # is zero (which also covers an empty list) is treated as perfect equality
+    total_wealth = float(scores.sum())
+    if abs(total_wealth) <= ZERO_TOL:
         return 0.0
 
-    N = len(savings)
-    cumsum = np.cumsum(savings) / total_wealth
-    gini = (N + 1 - 2 * np.sum(cumsum)) / N
+    # closed form of the Lorenz-curve Gini: sum_i (2i - N - 1) x_(i) / (N * sum_i x_i)
+    N = scores.size
+    idx = np.arange(1, N + 1, dtype=np.float64)
+    gini = (2.0 * idx - N - 1) @ scores / (N * total_wealth)
+
+    return float(gini)
+
+
+def get_concentration_coefficient(state: GameState) -> float:
+    """
+    Calculate the concentration form of the Gini coefficient, 1 - sum_i x_i^2 / S^2.
+
+    This is computed in O(1) from the running totals stored in `state.score_acc`, which makes it
+    cheap enough to log at every step. Note that it differs from the mean-difference Gini
+    returned by `get_gini_coefficient` (e.g. it equals 1 - 1/N for an equal distribution).
+
+    Parameters
+    ----------
+    state : GameState
+        The game state whose scores are used.
+
+    Returns
+    -------
+    float
+
+    """
+    total = state.score_acc.total
+    if abs(total) <= ZERO_TOL:
+        return 0.0
 
-    return gini
+    return 1.0 - state.score_acc.total_sq / (total * total)
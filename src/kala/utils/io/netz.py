@@ -1,16 +1,29 @@
 """Inputs and outputs."""
 
+import mmap
+import shutil
 import struct
+import warnings
 from pathlib import Path
 from urllib import request
 from urllib.error import HTTPError
 
 import networkx as nx
+import numpy as np
 import zstandard as zstd
 
 
+try:
+    from numba import njit
+except ImportError:  # numba is an optional dependency
+    njit = None  # type: ignore[assignment]
+
+
 CURRENT_DIR = Path(__file__).resolve().parent
 CACHE_DIR = CURRENT_DIR / "cache"
+CHUNK_SIZE = 1 << 20  # 1MB
+TIMEOUT = 60  # seconds
+FRAME_HEADER_MAX_SIZE = 18  # bytes, see ZSTD_FRAMEHEADERSIZE_MAX
 
 
 class NetzDatabase:
@@ -19,6 +32,14 @@ class NetzDatabase:
         if not CACHE_DIR.exists():
             CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+        # the directory is scanned once and the total is updated as files are added
+        self._cache_size = sum(f.stat().st_size for f in CACHE_DIR.glob("*") if f.is_file())
+
+        # a single opener is reused for all downloads; the files are zstd-compressed already so
+        # no transfer encoding is requested
+        self._opener = request.build_opener()
+        self._opener.addheaders = [("Accept-Encoding", "identity")]
+
     def get_file_name(
         self,
         network_name: str,
@@ -46,7 +67,7 @@ class NetzDatabase:
         url = base_url + f"/net/{network_name}/files/{net}.gt.zst"
         try:
             # Download to temporary file first
-            with request.urlopen(url) as http_f:
+            with self._opener.open(url, timeout=TIMEOUT) as http_f:
                 if http_f.status != 200:
                     raise HTTPError(
                         url,
@@ -56,23 +77,41 @@ class NetzDatabase:
                         http_f,
                     )
 
+                # the frame header records the decompressed size, unless it was compressed
+                # as a stream; in that case the compressed size is a lower bound
+                header = http_f.read(FRAME_HEADER_MAX_SIZE)
+                try:
+                    content_size = zstd.frame_content_size(header)
+                except zstd.ZstdError:
+                    content_size = -1
+                if content_size >= 0:
+                    self._ensure_cache_space(content_size)
+                else:
+                    self._ensure_cache_space(int(http_f.headers.get("Content-Length", 0)))
+
+                # stream the decompressed data to disk instead of holding it all in memory
                 dctx = zstd.ZstdDecompressor()
-                reader = dctx.stream_reader(http_f)
-                decompressed = reader.readall()
-
-                self._ensure_cache_space(len(decompressed))
+                with (
+                    open(temp_file, "wb") as f,
+                    dctx.stream_writer(f, write_size=CHUNK_SIZE, closefd=False) as writer,
+                ):
+                    writer.write(header)
+                    shutil.copyfileobj(http_f, writer, CHUNK_SIZE)
 
-                with open(temp_file, "wb") as f:
-                    f.write(decompressed)
+                if content_size < 0:
+                    self._ensure_cache_space(temp_file.stat().st_size)
 
                 # Atomic replace - will fail if another process beat us to it
                 try:
-                    temp_file.replace(file_name)
+                    self._replace_cached_file(temp_file, file_name)
                 except FileExistsError:
                     if not replace:
                         return  # Another process created the file, that's fine
                     raise  # If replace=True, propagate the error
 
+                # the cached arrays were parsed from the old file
+                self._remove_cached_file(file_name.with_suffix(".npz"))
+
         except Exception as e:
             # Clean up temp file if something went wrong
             if temp_file.exists():
@@ -103,23 +142,78 @@ class NetzDatabase:
             networkx.Graph
 
         """
+        sources, targets = self._read_edgelist(network_name, net, base_url=base_url)
+
+        # return g as an undirected graph; the edges are streamed to avoid building a list of tuples
+        graph = nx.Graph()
+        graph.add_edges_from(zip(sources.tolist(), targets.tolist()))
+
+        return graph
+
+    def _read_edgelist(
+        self,
+        network_name: str,
+        net: str | None = None,
+        base_url: str = "https://networks.skewed.de",
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Read the edgelist from the cached arrays, or parse and cache the `.gt` file."""
         file_name = self.get_file_name(network_name, net)
+        arrays_file = file_name.with_suffix(".npz")
+
+        # the arrays are stale if the `.gt` file was written after they were parsed
+        if arrays_file.exists() and (
+            not file_name.exists() or arrays_file.stat().st_mtime >= file_name.stat().st_mtime
+        ):
+            with np.load(arrays_file) as arrays:
+                return arrays["sources"], arrays["targets"]
 
         if not file_name.exists():
             self._download_file(network_name, net, base_url=base_url)
 
-        with open(file_name, "rb") as f:
-            data = f.read()
+        # parse graphtool binary format (memory-mapped so the file is not copied into memory)
+        with open(file_name, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            sources, targets, n_nodes = parse_graphtool_format_to_edgelist(data)
+
+        # the arrays only speed up later reads, so they are not cached when there is no space
+        old_size = arrays_file.stat().st_size if arrays_file.exists() else 0
+        if not self._has_cache_space(sources.nbytes + targets.nbytes - old_size):
+            warnings.warn("not enough space in the cache to store the parsed edgelist")
+            return sources, targets
 
-        # parse graphtool binary format
-        edgelist = parse_graphtool_format_to_edgelist(data)
+        temp_file = arrays_file.with_name(arrays_file.name + ".tmp")
+        try:
+            with open(temp_file, "wb") as out:
+                np.savez(out, sources=sources, targets=targets, n_nodes=n_nodes)
+            if self._has_cache_space(temp_file.stat().st_size - old_size):
+                self._replace_cached_file(temp_file, arrays_file)
+            else:
+                warnings.warn("not enough space in the cache to store the parsed edgelist")
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+
+        return sources, targets
 
-        return nx.Graph(edgelist, create_using=nx.Graph)  # return g as an undirected graph
+    def _replace_cached_file(self, temp_file: Path, file_name: Path) -> None:
+        """Move a temporary file into place and keep track of the size of the cache."""
+        old_size = file_name.stat().st_size if file_name.exists() else 0
+        temp_file.replace(file_name)
+        self._cache_size += file_name.stat().st_size - old_size
+
+    def _remove_cached_file(self, file_name: Path) -> None:
+        """Delete a file from the cache (if it exists) and keep track of the size of the cache."""
+        if file_name.exists():
+            size = file_name.stat().st_size
+            file_name.unlink()
+            self._cache_size -= size
+
+    def _has_cache_space(self, needed_bytes: int) -> bool:
+        """Check if there's enough space for the new file."""
+        return self._cache_size + needed_bytes <= self.max_cache_size
 
     def _ensure_cache_space(self, needed_bytes: int) -> None:
         """Check if there's enough space for the new file, raise error if not."""
-        total_size = sum(f.stat().st_size for f in CACHE_DIR.glob("*") if f.is_file())
-        if total_size + needed_bytes > self.max_cache_size:
+        if not self._has_cache_space(needed_bytes):
             msg = (
                 f"Cache directory would exceed size limit of {self.max_cache_size / 1024 / 1024:.1f}MB. "
                 f"Please manually clean the cache at:\n{CACHE_DIR}"
@@ -127,9 +221,11 @@ class NetzDatabase:
             raise RuntimeError(msg)
 
 
-def parse_graphtool_format_to_edgelist(data: bytes) -> list:
+def parse_graphtool_format_to_edgelist(
+    data: bytes | mmap.mmap,
+) -> tuple[np.ndarray, np.ndarray, int]:
     """
-    Decodes data in graph-tool binary format and returns an edgelist.
+    Decodes data in graph-tool binary format and returns an edgelist as two arrays.
     For a documentation of the graphtool binary format, see doc at
     https://graph-tool.skewed.de/static/doc/gt_format.html
 
@@ -137,13 +233,14 @@ def parse_graphtool_format_to_edgelist(data: bytes) -> list:
 
     Parameters
     ----------
-    data : bytes
+    data : bytes | mmap.mmap
         Array of bytes to be decoded.
 
     Returns
     -------
-    list[tuple]
-        The edgelist of the network.
+    tuple[np.ndarray, np.ndarray, int]
+        The sources and targets (int64 arrays) of the edgelist of the network, and the number of
+        nodes (which includes isolated nodes).
     """
 
     # check magic bytes
@@ -163,8 +260,11 @@ def parse_graphtool_format_to_edgelist(data: bytes) -> list:
         graphtool_endianness = "<"
     ptr += 1
 
+    # the length prefixes are all 8-byte unsigned integers
+    len_struct = struct.Struct(graphtool_endianness + "Q")
+
     # read length of comment
-    str_len = struct.unpack(graphtool_endianness + "Q", data[ptr : ptr + 8])[0]
+    str_len = len_struct.unpack_from(data, ptr)[0]
     ptr += 8
 
     # read string comment
@@ -176,7 +276,7 @@ def parse_graphtool_format_to_edgelist(data: bytes) -> list:
     ptr += 1
 
     # read number of nodes
-    n_nodes = struct.unpack(graphtool_endianness + "Q", data[ptr : ptr + 8])[0]
+    n_nodes = len_struct.unpack_from(data, ptr)[0]
     ptr += 8
 
     # determine binary representation of neighbour lists
@@ -193,21 +293,94 @@ def parse_graphtool_format_to_edgelist(data: bytes) -> list:
         fmt = "Q"
         d = 8
 
-    sources = []
-    targets = []
-    # parse lists of out-neighbors for all n nodes
-    n_edges = 0
+    if njit is not None:
+        buf = np.frombuffer(data, dtype=np.uint8)
+        sources, targets = _parse_neighbours_jit(buf, ptr, n_nodes, d, graphtool_endianness == ">")
+        return sources, targets, n_nodes
+
+    # first pass: read only the length prefixes (they determine where each list starts)
+    start = ptr
+    size = len(data)
+    counts = np.empty(n_nodes, dtype=np.int64)
+    prefixes = np.empty(n_nodes, dtype=np.int64)
     for v in range(n_nodes):
         # read number of neighbors
-        num_neighbors = struct.unpack(graphtool_endianness + "Q", data[ptr : ptr + 8])[0]
-        ptr += 8
+        if ptr + 8 > size:
+            raise ValueError("Invalid graphtool file. The file is truncated.")
+        num_neighbors = len_struct.unpack_from(data, ptr)[0]
+        counts[v] = num_neighbors
+        prefixes[v] = ptr - start
+        ptr += 8 + num_neighbors * d
+
+    if ptr > size:
+        raise ValueError("Invalid graphtool file. The file is truncated.")
+
+    # second pass: once the prefixes are masked out, the remaining bytes are the concatenation of
+    # all the neighbour lists which share the same binary representation
+    buf = np.frombuffer(data, dtype=np.uint8, count=ptr - start, offset=start)
+    is_neighbour = np.ones(buf.size, dtype=bool)
+    is_neighbour[(prefixes[:, None] + np.arange(8)).ravel()] = False
+
+    dtype = np.dtype(graphtool_endianness + fmt)
+    sources = np.repeat(np.arange(n_nodes, dtype=np.int64), counts)
+    targets = buf[is_neighbour].view(dtype).astype(np.int64)
+
+    return sources, targets, n_nodes
+
+
+def _read_uint(buf: np.ndarray, ptr: int, size: int, big_endian: bool) -> int:
+    """Assemble an unsigned integer of `size` bytes starting at `buf[ptr]`."""
+    val = 0
+    if big_endian:
+        for k in range(size):
+            val = (val << 8) | int(buf[ptr + k])
+    else:
+        for k in range(size):
+            val |= int(buf[ptr + k]) << (8 * k)
+    return val
+
+
+def _parse_neighbours(
+    buf: np.ndarray,
+    ptr: int,
+    n_nodes: int,
+    d: int,
+    big_endian: bool,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the lists of out-neighbours of a graphtool file (meant to be compiled with numba).
 
-        # add edges to record
+    A first pass reads only the length prefixes so that the edge arrays can be preallocated (and
+    checks that all the lists are within the buffer, so the second pass can read them unchecked).
+    """
+    n_edges = 0
+    p = ptr
+    for _ in range(n_nodes):
+        if p + 8 > buf.size:
+            raise ValueError("Invalid graphtool file. The file is truncated.")
+        num_neighbors = _read_uint(buf, p, 8, big_endian)
+        n_edges += num_neighbors
+        p += 8 + num_neighbors * d
+        if p > buf.size:
+            raise ValueError("Invalid graphtool file. The file is truncated.")
+
+    sources = np.empty(n_edges, dtype=np.int64)
+    targets = np.empty(n_edges, dtype=np.int64)
+
+    i = 0
+    p = ptr
+    for v in range(n_nodes):
+        num_neighbors = _read_uint(buf, p, 8, big_endian)
+        p += 8
         for _ in range(num_neighbors):
-            w = struct.unpack(graphtool_endianness + fmt, data[ptr : ptr + d])[0]
-            ptr += d
-            sources.append(v)
-            targets.append(w)
-            n_edges += 1
+            sources[i] = v
+            targets[i] = _read_uint(buf, p, d, big_endian)
+            p += d
+            i += 1
+
+    return sources, targets
+
 
-    return list(zip(sources, targets))
+if njit is not None:
+    _read_uint = njit(cache=True)(_read_uint)
+    _parse_neighbours_jit = njit(cache=True)(_parse_neighbours)
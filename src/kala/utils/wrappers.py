@@ -1,5 +1,3 @@
-from collections import deque
-
 import numpy as np
 
 from kala.models import (
@@ -67,7 +65,7 @@ def init_saver_agent(
 
     props = SaverProperties(is_saver=is_saver)
     memory_length = memory_length or 10
-    memory: CappedMemory = deque([], maxlen=memory_length)
+    memory = CappedMemory([], maxlen=memory_length)
 
     return SaverAgent(traits, props, memory, score=0, update_rule=update_rule)
 
@@ -102,10 +100,14 @@ def init_savers_gamestate_from_netz(
     num_nodes = graph.number_of_nodes()
 
     rng = np.random.default_rng()
-    is_saver = rng.choice([True, False], num_nodes, p=[savers_share, 1 - savers_share])
+    is_saver = rng.random(num_nodes) < savers_share
 
+    # the rule is stateless so a single instance is shared by all agents
     rule = SaverFlipAfterFractionLost(frac=memory_frac)
-    agents = [init_saver_agent(s, memory_length=memory_length, update_rule=rule) for s in is_saver]
+    agents = [
+        init_saver_agent(s, memory_length=memory_length, update_rule=rule)
+        for s in is_saver.tolist()
+    ]
     placement = AgentPlacementNetX.init_bijection(agents, graph)
 
     return GameState(graph, agents, placement, SaverCooperationPayoffStrategy(), MatchingStrategy())
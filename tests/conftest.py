@@ -12,21 +12,34 @@ from kala import (
 )
 
 
-@pytest.fixture(scope="function")
-def fixture_networkx_graph():
-    """Return the butterfly graph."""
+def _butterfly_graph():
     g = nx.Graph()
     g.add_edges_from([(0, 1), (0, 2), (1, 2), (2, 3), (3, 4), (3, 5), (4, 5)])
     return g
 
 
+def _saver_agents():
+    is_saver = [True] * 3 + [False] * 3
+    groups = [0] * 3 + [1] * 3
+    return [init_saver_agent(is_saver=s, group=g) for s, g in zip(is_saver, groups)]
+
+
+@pytest.fixture(scope="function")
+def fixture_networkx_graph():
+    """Return the butterfly graph."""
+    return _butterfly_graph()
+
+
 @pytest.fixture(scope="function")
 def fixture_saver_agents():
     """Return a list of 3 saver agents and 3 non-saver agents."""
-    is_saver = [True] * 3 + [False] * 3
-    groups = [0] * 3 + [1] * 3
-    agents = [init_saver_agent(is_saver=s, group=g) for s, g in zip(is_saver, groups)]
-    return agents
+    return _saver_agents()
+
+
+@pytest.fixture(scope="session")
+def fixture_agent_pair():
+    """Return a saver and a non-saver that are built once (they should only be read)."""
+    return init_saver_agent(is_saver=True), init_saver_agent(is_saver=False)
 
 
 @pytest.fixture(scope="function")
@@ -35,31 +48,44 @@ def fixture_agent_placement(fixture_saver_agents, fixture_networkx_graph):
     return AgentPlacementNetX.init_bijection(fixture_saver_agents, fixture_networkx_graph)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def fixture_deterministic_cooperation_strategy():
     """Return a deterinistic cooperation strategy."""
     return SaverCooperationPayoffStrategy(stochastic=False)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def fixture_matching_strategy():
     """Return a deterministic matching strategy."""
     return MatchingStrategy()
 
 
+def _game_state(payoff_strategy, matching_strategy):
+    graph = _butterfly_graph()
+    agents = _saver_agents()
+    return GameState(
+        graph=graph,
+        agents=agents,
+        placements=AgentPlacementNetX.init_bijection(agents, graph),
+        payoff_strategy=payoff_strategy,
+        matching_strategy=matching_strategy,
+    )
+
+
+@pytest.fixture(scope="session")
+def fixture_base_game_state(
+    fixture_deterministic_cooperation_strategy,
+    fixture_matching_strategy,
+):
+    """Return a game that is built once per session (use `copy()` before modifying it)."""
+    return _game_state(fixture_deterministic_cooperation_strategy, fixture_matching_strategy)
+
+
 @pytest.fixture(scope="function")
 def fixture_game_state(
-    fixture_networkx_graph,
-    fixture_saver_agents,
-    fixture_agent_placement,
     fixture_deterministic_cooperation_strategy,
     fixture_matching_strategy,
 ):
-    """Return a game."""
-    return GameState(
-        graph=fixture_networkx_graph,
-        agents=fixture_saver_agents,
-        placements=fixture_agent_placement,
-        payoff_strategy=fixture_deterministic_cooperation_strategy,
-        matching_strategy=fixture_matching_strategy,
-    )
+    """Return a new game (its agents are not those of `fixture_saver_agents`)."""
+    # NB: building the small game is ~4x faster than a (deep) copy of `fixture_base_game_state`
+    return _game_state(fixture_deterministic_cooperation_strategy, fixture_matching_strategy)
@@ -1,11 +1,15 @@
 """Test the agents module."""
 
+from collections import deque
 from uuid import UUID
 
 import numpy as np
 import pytest
 
 from kala import SaverFlipAfterFractionLost, init_saver_agent
+from kala.models.agents import SaverAgent
+from kala.models.data import SaverProperties, SaverTraits
+from kala.models.memory import MemoryItem
 
 
 NUM_GAMES = 5
@@ -47,3 +51,58 @@ def test_update_rule(saver_agent_with_update_rule):
     for i in range(2 * NUM_GAMES):
         agent.update(payoff=1.0, lost_match=True, time=i)
         assert agent.properties.is_saver == expected_states[i]
+
+
+class FlipEveryTime:
+    """An update rule that does not subclass `UpdateRule` (so it lacks `needs_full_memory`)."""
+
+    def update(self, properties, memory):
+        properties.is_saver = not properties.is_saver
+
+
+def test_update_rule_without_subclassing():
+    """Test that update rules only need to implement `update`."""
+    agent = init_saver_agent(is_saver=True, memory_length=NUM_GAMES, update_rule=FlipEveryTime())
+    agent.update(payoff=1.0, lost_match=True, time=0)
+    assert not agent.properties.is_saver
+
+
+def test_memory_counts_lost_matches(saver_agent):
+    """Test that the count of lost matches is kept up to date as the memory fills up."""
+    agent = saver_agent
+    lost = [True, False, True, True, False, False, True]
+
+    for i, lost_match in enumerate(lost):
+        agent.update(payoff=1.0, lost_match=lost_match, time=i)
+        recent = lost[max(0, i + 1 - NUM_GAMES) : i + 1]
+        assert agent.memory.num_lost == sum(recent)
+
+    agent.memory.popleft()
+    assert agent.memory.num_lost == sum(lost[-NUM_GAMES + 1 :])
+
+    agent.memory.clear()
+    assert agent.memory.num_lost == 0
+
+
+def test_update_rule_with_deque_memory():
+    """Test that agents built with a plain deque (with a maxlen) as their memory still work."""
+    agent = SaverAgent(
+        SaverTraits(group=None, min_specialization=0.0, income_per_period=0.0),
+        SaverProperties(is_saver=True),
+        memory=deque(maxlen=NUM_GAMES),
+        update_rule=SaverFlipAfterFractionLost(frac=0.5),
+    )
+    assert agent.memory.maxlen == NUM_GAMES
+
+    for i in range(NUM_GAMES):
+        agent.update(payoff=1.0, lost_match=True, time=i)
+    assert not agent.properties.is_saver
+
+    # the rule can also be applied to a plain deque directly
+    properties = SaverProperties(is_saver=True)
+    items = [
+        MemoryItem(payoff=1.0, score=1.0, match_lost=True, time=i, properties=properties)
+        for i in range(NUM_GAMES)
+    ]
+    SaverFlipAfterFractionLost(frac=0.5).update(properties, deque(items, maxlen=NUM_GAMES))
+    assert not properties.is_saver
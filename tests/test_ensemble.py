@@ -0,0 +1,59 @@
+"""Test the ensemble module."""
+
+import networkx as nx
+import numpy as np
+
+from kala import (
+    AgentPlacementNetX,
+    GamePlan,
+    GameState,
+    MatchingStrategy,
+    SaverCooperationPayoffStrategy,
+    init_saver_agent,
+    run_ensemble,
+)
+from kala.models.shocks import RemoveRandomPlayer
+
+
+STEPS = 5
+
+
+def build_game(seed):
+    """Build a small seeded game (defined at the top level so it can be pickled)."""
+    graph = nx.barabasi_albert_graph(20, 2, seed=seed)
+    agents = [init_saver_agent(is_saver=bool(i % 2)) for i in range(20)]
+    state = GameState(
+        graph,
+        agents,
+        AgentPlacementNetX.init_bijection(agents, graph),
+        SaverCooperationPayoffStrategy(stochastic=False),
+        MatchingStrategy(rng=seed),
+    )
+    return state, GamePlan(steps=STEPS + seed, shocks={2: [RemoveRandomPlayer(rng=seed)]})
+
+
+def test_run_ensemble():
+    """Test that the games are played in parallel and in the current process alike."""
+    seeds = [0, 1, 2]
+    scores = run_ensemble(build_game, seeds, n_workers=2)
+
+    # the plans have different numbers of steps and the shorter games are padded with NaN
+    assert scores.shape == (len(seeds), STEPS + 2)
+    for seed, row in zip(seeds, scores):
+        assert np.all(np.diff(row[: STEPS + seed]) > 0)  # every step adds positive payoffs
+        assert np.isnan(row[STEPS + seed :]).all()
+
+    # the games are seeded, so playing them in the current process gives the same scores
+    assert np.array_equal(run_ensemble(build_game, seeds, n_workers=1), scores, equal_nan=True)
+
+    def num_agents(state):
+        return len(state.agents)
+
+    # a local function cannot be pickled so the games are played in the current process
+    counts = run_ensemble(build_game, seeds, statistic=num_agents)
+    assert counts[:, :STEPS].tolist() == [[20, 20, 19, 19, 19]] * len(seeds)
+
+
+def test_run_ensemble_without_seeds():
+    """Test that no games are built when there are no seeds."""
+    assert run_ensemble(build_game, [], n_workers=1).shape == (0, 0)
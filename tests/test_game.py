@@ -1,7 +1,9 @@
 """Test the game module."""
 
+import networkx as nx
 import pytest
 
+from kala import AgentPlacementNetX, init_saver_agent
 from kala.models.game import GamePlan, GameState, play_game
 from kala.models.shocks import RemoveRandomPlayer, SwapRandomEdge
 
@@ -45,3 +47,80 @@ def test_play_game(fixture_game_state, fixture_game_plan):
         # Basic invariants that should always hold
         assert isinstance(state, GameState)
         assert state.graph.number_of_nodes() > 0
+
+
+def test_play_game_yield_every(fixture_game_state, fixture_game_plan):
+    """Test that only some of the steps are yielded."""
+    times = [time for time, _ in play_game(fixture_game_state, fixture_game_plan, yield_every=3)]
+    assert times == [2, 4, 5, 6, 8, 9]  # every 3rd step, the shocks and the last step
+
+    with pytest.raises(ValueError):
+        next(play_game(fixture_game_state, fixture_game_plan, yield_every=0))
+
+
+class FixedMatches:
+    """A matching strategy that always plays the same matches."""
+
+    def select_matches(self, placements, graph):
+        return [
+            [placements.get_agent(0), placements.get_agent(1)],
+            [placements.get_agent(3), placements.get_agent(4)],
+        ]
+
+
+class SingleMatchPayoffs:
+    """A payoff strategy that only implements `calculate_payoff` (without subclassing)."""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+
+    def calculate_payoff(self, agents):
+        return self.strategy.calculate_payoff(agents)
+
+
+def test_play_step_without_batch_payoffs(fixture_deterministic_cooperation_strategy):
+    """Test that a payoff strategy without `calculate_payoffs` is played match by match."""
+    scores = []
+    for payoff_strategy in [
+        fixture_deterministic_cooperation_strategy,
+        SingleMatchPayoffs(fixture_deterministic_cooperation_strategy),
+    ]:
+        graph = nx.path_graph(6)
+        agents = [init_saver_agent(is_saver=i < 3) for i in range(6)]
+        placements = AgentPlacementNetX.init_bijection(agents, graph)
+        game = GameState(graph, agents, placements, payoff_strategy, FixedMatches())
+        for _ in play_game(game, GamePlan(steps=2, shocks={})):
+            pass
+        assert game.scores.tolist() == [a.score for a in game.agents]
+        scores.append([a.score for a in game.agents])
+
+    assert scores[0] == scores[1]
+    assert scores[0][2] == scores[0][5] == 0.0
+
+
+def test_game_state_copy(fixture_base_game_state):
+    """Test that a copy of the game can be played without changing the original."""
+    base = fixture_base_game_state
+    game = base.copy()
+    assert game.payoff_strategy is base.payoff_strategy
+    assert [a.uuid for a in game.agents] == [a.uuid for a in base.agents]
+
+    for _ in play_game(game, GamePlan(steps=3, shocks={0: [RemoveRandomPlayer()]})):
+        pass
+
+    assert len(game.agents) == len(base.agents) - 1
+    assert all(a.score == 0 for a in base.agents)
+    assert game.placements.get_position(game.agents[0]) is not None
+
+
+def test_game_state_copy_memory(fixture_game_state):
+    """Test that the copied memories keep the same count of matches lost."""
+    game = fixture_game_state
+    for agent in game.agents:
+        for time, lost_match in enumerate([True, False, True]):
+            agent.add_memory(payoff=0.0, lost_match=lost_match, time=time)
+
+    other = game.copy()
+    for agent, copied in zip(game.agents, other.agents):
+        assert len(copied.memory) == len(agent.memory) < agent.memory.maxlen
+        assert copied.memory.num_lost == agent.memory.num_lost == 2
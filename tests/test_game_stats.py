@@ -0,0 +1,128 @@
+"""Test the game_stats module."""
+
+import numpy as np
+import pytest
+
+from kala import (
+    GamePlan,
+    get_concentration_coefficient,
+    get_gini_coefficient,
+    get_summed_score,
+    init_saver_agent,
+    play_game,
+)
+from kala.models.game import play_step
+from kala.models.shocks import RemovePlayer, RemoveRandomPlayer
+
+
+def test_gini_coefficient(fixture_saver_agents):
+    """Test the Gini coefficient against known distributions."""
+    agents = fixture_saver_agents
+    assert get_gini_coefficient(agents) == 0.0  # all scores are zero
+    assert get_gini_coefficient([]) == 0.0
+
+    for a in agents:
+        a.score = 1.0
+    assert get_gini_coefficient(agents) == pytest.approx(0.0)
+
+    # a single agent holds all of the wealth: G = (N - 1) / N
+    for a in agents[1:]:
+        a.score = 0.0
+    assert get_gini_coefficient(agents) == pytest.approx(5 / 6)
+
+    for a, s in zip(agents, [3.0, 1.0, 2.0, 0.0, 5.0, 4.0]):
+        a.score = s
+    assert get_gini_coefficient(agents) == pytest.approx(7 / 18)
+
+
+def test_gini_coefficient_negative_scores(fixture_saver_agents):
+    """Test that negative scores (and a negative total) are not reported as perfect equality."""
+    agents = fixture_saver_agents
+    scores = [-3.0, -1.0, -2.0, 0.5, -5.0, -4.0]
+    for a, s in zip(agents, scores):
+        a.score = s
+
+    # the Lorenz-curve formula, computed directly
+    cumsum = np.cumsum(sorted(scores)) / sum(scores)
+    expected = (len(scores) + 1 - 2 * cumsum.sum()) / len(scores)
+    assert expected != 0.0
+    assert get_gini_coefficient(agents) == pytest.approx(expected)
+
+
+def test_concentration_coefficient(fixture_game_state):
+    """Test that the running score totals match a full recomputation."""
+    game = fixture_game_state
+    assert get_concentration_coefficient(game) == 0.0
+
+    plan = GamePlan(steps=5, shocks={3: [RemoveRandomPlayer()]})
+    for _, state in play_game(game, plan):
+        scores = np.array([a.score for a in state.agents])
+        assert state.score_acc.total == pytest.approx(scores.sum())
+        assert state.score_acc.total_sq == pytest.approx((scores**2).sum())
+
+        expected = 1 - (scores**2).sum() / scores.sum() ** 2
+        assert get_concentration_coefficient(state) == pytest.approx(expected)
+
+
+def test_summed_score_from_state(fixture_game_state):
+    """Test that the score array of the game state is kept in sync with the agents."""
+    game = fixture_game_state
+
+    plan = GamePlan(steps=5, shocks={3: [RemoveRandomPlayer()]})
+    for _, state in play_game(game, plan):
+        scores = [a.score for a in state.agents]
+        assert state.scores.tolist() == pytest.approx(scores)
+        assert get_summed_score(state) == pytest.approx(get_summed_score(state.agents))
+        assert get_gini_coefficient(state) == pytest.approx(get_gini_coefficient(state.agents))
+
+
+def test_stats_after_shock_outside_game(fixture_game_state):
+    """Test that the stats stay in sync when a player is removed outside of `play_game`."""
+    game = fixture_game_state
+
+    play_step(0, game)
+    top_scorer = max(game.agents, key=lambda a: a.score)
+    RemovePlayer(top_scorer).apply(game)
+    play_step(1, game)
+
+    assert len(game.scores) == len(game.agents) == 5
+    assert get_summed_score(game) == pytest.approx(get_summed_score(game.agents))
+    assert get_gini_coefficient(game) == pytest.approx(get_gini_coefficient(game.agents))
+
+    scores = np.array([a.score for a in game.agents])
+    expected = 1 - (scores**2).sum() / scores.sum() ** 2
+    assert get_concentration_coefficient(game) == pytest.approx(expected)
+
+
+class AddPlayerOutsideState:
+    """A custom shock that places a new player without going through `GameState.add_agent`."""
+
+    def __init__(self, position):
+        self.position = position
+
+    def apply(self, state):
+        agent = init_saver_agent(is_saver=True)
+        state.placements.add_agent(agent, self.position)
+        state.agents.append(agent)
+        return state
+
+
+@pytest.mark.parametrize("use_add_agent", [True, False])
+def test_stats_after_adding_player(fixture_game_state, use_add_agent):
+    """Test that the stats stay in sync when a player is added (with or without `add_agent`)."""
+    game = fixture_game_state
+
+    play_step(0, game)
+    position = game.placements.get_position(game.agents[0])
+    RemovePlayer(game.agents[0]).apply(game)
+    if use_add_agent:
+        game.add_agent(init_saver_agent(is_saver=True), position)
+    else:
+        AddPlayerOutsideState(position).apply(game)
+    play_step(1, game)
+    play_step(2, game)
+
+    assert len(game.scores) == len(game.agents) == 6
+    assert game.placements.get_agent(position) is game.agents[-1]
+    assert game.scores.tolist() == [a.score for a in game.agents]
+    assert get_summed_score(game) == pytest.approx(get_summed_score(game.agents))
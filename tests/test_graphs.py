@@ -1,9 +1,13 @@
 """Test the graphs module."""
 
+import networkx as nx
 import pytest
 
 from kala.models.agents import SaverAgent
-from kala.models.graphs import AgentPlacementNetX, get_neighbours
+from kala.models.game import GameState
+from kala.models.graphs import AgentPlacementNetX, CSRGraph, get_neighbours
+from kala.models.shocks import AddEdge
+from kala.models.strategies import MatchingStrategy, SaverCooperationPayoffStrategy
 
 
 def test_get_agent_get_neighbours(
@@ -37,6 +41,12 @@ def test_get_position(fixture_saver_agents, fixture_networkx_graph, fixture_agen
     neighs = get_neighbours(agent, g, plcmt)  # repeats test above
     assert len(neighs) == 3
 
+    plcmt.clear_node(2)
+    assert plcmt.get_position(agent) is None
+
+    plcmt.add_agent(agent, 2)
+    assert plcmt.get_position(agent) == 2
+
 
 def test_add_agent(fixture_saver_agents):
     """Test the method add_agent."""
@@ -68,3 +78,110 @@ def test_clear_node(fixture_networkx_graph, fixture_agent_placement):
 
     # The remaining RHS node should be disconnected
     assert get_neighbours(plcmt.get_agent(5), fixture_networkx_graph, plcmt) == []
+
+
+def test_get_neighbours_copy(fixture_networkx_graph, fixture_agent_placement):
+    """Test that modifying the returned neighbours does not change the placements."""
+    plcmt = fixture_agent_placement
+    agent = plcmt.get_agent(2)
+
+    neighs = get_neighbours(agent, fixture_networkx_graph, plcmt)
+    neighs.clear()
+    assert len(get_neighbours(agent, fixture_networkx_graph, plcmt)) == 3
+
+
+@pytest.mark.parametrize("use_csr", [False, True])
+def test_get_neighbours_after_edge_change(fixture_networkx_graph, fixture_agent_placement, use_csr):
+    """Test that the cached neighbours follow edges added or removed directly on the graph."""
+    g = CSRGraph.from_networkx(fixture_networkx_graph) if use_csr else fixture_networkx_graph
+    plcmt = fixture_agent_placement
+    agent = plcmt.get_agent(5)
+    assert len(get_neighbours(agent, g, plcmt)) == 2
+
+    g.add_edge(5, 0)
+    assert plcmt.get_agent(0) in get_neighbours(agent, g, plcmt)
+
+    g.remove_edge(5, 4)
+    g.remove_edge(5, 3)
+    assert get_neighbours(agent, g, plcmt) == [plcmt.get_agent(0)]
+
+
+class DictPlacement:
+    """A placement that implements the protocol without subclassing it (nor caching)."""
+
+    def __init__(self, agents, graph):
+        self.mapping = dict(zip(graph, agents))
+
+    def get_position(self, agent):
+        return next((k for k, v in self.mapping.items() if v is agent), None)
+
+    def get_agent(self, position):
+        return self.mapping.get(position)
+
+
+def test_placement_without_neighbour_methods(fixture_saver_agents, fixture_networkx_graph):
+    """Test that placements do not need to implement `get_neighbours` and `invalidate`."""
+    g = fixture_networkx_graph
+    agents = fixture_saver_agents
+    plcmt = DictPlacement(agents, g)
+
+    assert get_neighbours(agents[2], g, plcmt) == [agents[0], agents[1], agents[3]]
+    matches = MatchingStrategy().select_matches(plcmt, g)
+    assert all(b in get_neighbours(a, g, plcmt) for a, b in matches)
+
+    game = GameState(g, agents, plcmt, SaverCooperationPayoffStrategy(), MatchingStrategy())
+    AddEdge(agents[0], agents[5]).apply(game)
+    assert agents[5] in get_neighbours(agents[0], g, plcmt)
+
+
+def test_csr_graph(fixture_networkx_graph):
+    """Test that the CSR graph matches the NetworkX graph it was built from."""
+    g = fixture_networkx_graph  # pylint: disable=invalid-name
+    csr = CSRGraph.from_networkx(g)
+
+    assert csr.number_of_nodes() == g.number_of_nodes()
+    assert csr.number_of_edges() == g.number_of_edges()
+    assert list(csr) == list(g)
+    for node in g:
+        assert sorted(csr.neighbours(node).tolist()) == sorted(g.neighbors(node))
+
+    csr.add_edge(5, 0)
+    assert csr.has_edge(0, 5)
+    assert csr.number_of_edges() == 8
+    assert csr.neighbours(0).tolist() == [1, 2, 5]
+
+    csr.remove_edge(2, 3)
+    assert csr.number_of_edges() == 7
+    assert csr.neighbours(3).tolist() == [4, 5]
+
+    with pytest.raises(ValueError):
+        csr.remove_edge(2, 3)  # already removed
+
+    with pytest.raises(ValueError):
+        csr.add_edge(0, 6)  # not a node
+
+
+def test_csr_graph_is_connected(fixture_networkx_graph):
+    """Test the connectivity check of the CSR graph."""
+    csr = CSRGraph.from_networkx(fixture_networkx_graph)
+    assert csr.is_connected()
+
+    csr.remove_edge(2, 3)  # the bridge between the two sides of the butterfly
+    assert not csr.is_connected()
+
+    for seed in range(5):
+        g = nx.gnp_random_graph(50, 0.05, seed=seed)  # pylint: disable=invalid-name
+        assert CSRGraph.from_networkx(g).is_connected() == nx.is_connected(g)
+
+    with pytest.raises(ValueError):
+        CSRGraph(0).is_connected()
+
+
+def test_csr_graph_get_neighbours(fixture_saver_agents, fixture_networkx_graph):
+    """Test that agents can be placed on top of a CSR graph."""
+    csr = CSRGraph.from_networkx(fixture_networkx_graph)
+    plcmt = AgentPlacementNetX.init_bijection(fixture_saver_agents, csr)
+
+    agent = plcmt.get_agent(2)
+    neighs = get_neighbours(agent, csr, plcmt)
+    assert neighs == [fixture_saver_agents[i] for i in (0, 1, 3)]
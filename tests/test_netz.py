@@ -0,0 +1,192 @@
+"""Test the netz module."""
+
+import io
+import struct
+
+import pytest
+import zstandard as zstd
+
+from kala.utils.io import netz
+from kala.utils.io.netz import parse_graphtool_format_to_edgelist
+
+
+EDGES = [(0, 1), (0, 2), (1, 2), (2, 3), (3, 4), (3, 5), (4, 5)]
+
+
+def encode_graphtool(edges: list[tuple[int, int]], n_nodes: int, endianness: str) -> bytes:
+    """Encode an edgelist in the graph-tool binary format (without property maps)."""
+    comment = b"kala test graph"
+    data = b"\xe2\x9b\xbe\x20\x67\x74" + bytes([1, endianness == ">"])
+    data += struct.pack(endianness + "Q", len(comment)) + comment
+    data += bytes([0])  # undirected
+    data += struct.pack(endianness + "Q", n_nodes)
+
+    for v in range(n_nodes):
+        neighbours = [w for u, w in edges if u == v]
+        data += struct.pack(endianness + "Q", len(neighbours))
+        data += struct.pack(endianness + "B" * len(neighbours), *neighbours)
+
+    return data
+
+
+@pytest.mark.parametrize("endianness", ["<", ">"])
+def test_parse_graphtool_format(endianness):
+    """Test that the parser recovers the encoded edgelist."""
+    data = encode_graphtool(EDGES, 6, endianness)
+    sources, targets, n_nodes = parse_graphtool_format_to_edgelist(data)
+    assert n_nodes == 6
+    assert list(zip(sources.tolist(), targets.tolist())) == EDGES
+
+
+def test_parse_graphtool_format_without_numba(monkeypatch):
+    """Test the pure Python fallback used when numba is not installed."""
+    monkeypatch.setattr(netz, "njit", None)
+    data = encode_graphtool(EDGES, 6, "<")
+    sources, targets, n_nodes = parse_graphtool_format_to_edgelist(data)
+    assert n_nodes == 6
+    assert list(zip(sources.tolist(), targets.tolist())) == EDGES
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+@pytest.mark.parametrize("cut", [1, 5, 20])
+def test_parse_graphtool_format_truncated(monkeypatch, use_numba, cut):
+    """Test that truncated files are rejected by both parsers."""
+    if not use_numba:
+        monkeypatch.setattr(netz, "njit", None)
+    elif netz.njit is None:
+        pytest.skip("numba is not installed")
+
+    data = encode_graphtool(EDGES, 6, "<")[:-cut]
+    with pytest.raises(ValueError, match="truncated"):
+        parse_graphtool_format_to_edgelist(data)
+
+
+def test_parse_graphtool_format_magic_bytes():
+    """Test that invalid files are rejected."""
+    with pytest.raises(Exception, match="magic bytes"):
+        parse_graphtool_format_to_edgelist(b"\x00" * 32)
+
+
+def test_read_network_from_cache(monkeypatch, tmp_path):
+    """Test that a cached network is parsed once and then read from the stored arrays."""
+    monkeypatch.setattr(netz, "CACHE_DIR", tmp_path)
+    db = netz.NetzDatabase()
+
+    file_name = db.get_file_name("butterfly")
+    file_name.write_bytes(encode_graphtool(EDGES, 6, "<"))
+
+    graph = db.read_netzschleuder_network("butterfly")
+    assert sorted(graph.edges) == EDGES
+    assert file_name.with_suffix(".npz").exists()
+
+    # the .gt file is no longer needed once the arrays are cached
+    file_name.unlink()
+    graph = db.read_netzschleuder_network("butterfly")
+    assert sorted(graph.edges) == EDGES
+
+
+@pytest.mark.parametrize("with_arrays_size", [False, True])
+def test_read_network_without_cache_space(monkeypatch, tmp_path, with_arrays_size):
+    """Test that a network is still read when its arrays do not fit in the cache."""
+    monkeypatch.setattr(netz, "CACHE_DIR", tmp_path)
+    data = encode_graphtool(EDGES, 6, "<")
+    file_name = netz.NetzDatabase().get_file_name("butterfly")
+    file_name.write_bytes(data)
+
+    # when the raw arrays fit (but not the .npz file with its header) the file is written first
+    sources, targets, _ = parse_graphtool_format_to_edgelist(data)
+    arrays_size = sources.nbytes + targets.nbytes if with_arrays_size else 0
+    db = netz.NetzDatabase(max_cache_size_bytes=len(data) + arrays_size)
+    with pytest.warns(UserWarning, match="not enough space"):
+        graph = db.read_netzschleuder_network("butterfly")
+    assert sorted(graph.edges) == EDGES
+    assert [f.name for f in tmp_path.iterdir()] == [file_name.name]
+    assert db._cache_size == len(data)
+
+
+class FakeResponse(io.BytesIO):
+    """Minimal stand-in for the response returned by `urlopen`."""
+
+    status = 200
+    reason = "OK"
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.headers = {"Content-Length": str(len(data))}
+
+
+def test_download_file(monkeypatch, tmp_path):
+    """Test that a downloaded network is decompressed into the cache."""
+    monkeypatch.setattr(netz, "CACHE_DIR", tmp_path)
+    data = encode_graphtool(EDGES, 6, "<")
+    compressed = zstd.ZstdCompressor().compress(data)
+
+    db = netz.NetzDatabase()
+    monkeypatch.setattr(db._opener, "open", lambda url, timeout: FakeResponse(compressed))
+
+    db._download_file("butterfly")
+    assert db.get_file_name("butterfly").read_bytes() == data
+    assert db._cache_size == len(data)
+
+    db.max_cache_size = len(data) - 1
+    with pytest.raises(RuntimeError, match="exceed size limit"):
+        db._download_file("butterfly", replace=True)
+    assert not db.get_file_name("butterfly").with_suffix(".tmp").exists()
+
+
+def test_download_file_invalidates_cached_arrays(monkeypatch, tmp_path):
+    """Test that replacing a downloaded network discards the arrays parsed from the old file."""
+    monkeypatch.setattr(netz, "CACHE_DIR", tmp_path)
+    file_name = netz.NetzDatabase().get_file_name("butterfly")
+    file_name.write_bytes(encode_graphtool(EDGES[:-1], 6, "<"))
+
+    db = netz.NetzDatabase()
+    db.read_netzschleuder_network("butterfly")
+    assert file_name.with_suffix(".npz").exists()
+
+    compressed = zstd.ZstdCompressor().compress(encode_graphtool(EDGES, 6, "<"))
+    monkeypatch.setattr(db._opener, "open", lambda url, timeout: FakeResponse(compressed))
+    db._download_file("butterfly", replace=True)
+    assert not file_name.with_suffix(".npz").exists()
+
+    graph = db.read_netzschleuder_network("butterfly")
+    assert sorted(graph.edges) == EDGES
+    assert db._cache_size == sum(f.stat().st_size for f in tmp_path.iterdir())
+
+
+def test_download_file_checks_frame_content_size(monkeypatch, tmp_path):
+    """Test that the decompressed size in the frame header is checked before writing."""
+    monkeypatch.setattr(netz, "CACHE_DIR", tmp_path)
+    data = encode_graphtool(EDGES, 6, "<")
+    compressed = zstd.ZstdCompressor().compress(data)
+
+    db = netz.NetzDatabase(max_cache_size_bytes=len(data) - 1)
+    monkeypatch.setattr(db._opener, "open", lambda url, timeout: FakeResponse(compressed))
+
+    opened = []
+    monkeypatch.setattr(netz, "open", lambda *args: opened.append(args), raising=False)
+    with pytest.raises(RuntimeError, match="exceed size limit"):
+        db._download_file("butterfly")
+    assert not opened
+    assert not any(tmp_path.iterdir())
+
+
+def test_download_file_without_frame_content_size(monkeypatch, tmp_path):
+    """Test that streamed frames (which do not record their size) are checked after writing."""
+    monkeypatch.setattr(netz, "CACHE_DIR", tmp_path)
+    data = encode_graphtool(EDGES, 6, "<")
+    cobj = zstd.ZstdCompressor().compressobj()
+    compressed = cobj.compress(data) + cobj.flush()
+    assert zstd.frame_content_size(compressed) == -1
+
+    # the compressed size fits in the cache, but the decompressed file does not
+    assert len(compressed) < len(data)
+    db = netz.NetzDatabase(max_cache_size_bytes=len(compressed))
+    monkeypatch.setattr(db._opener, "open", lambda url, timeout: FakeResponse(compressed))
+    with pytest.raises(RuntimeError, match="exceed size limit"):
+        db._download_file("butterfly")
+    assert not any(tmp_path.iterdir())
+
+    db.max_cache_size = len(data)
+    db._download_file("butterfly")
+    assert db.get_file_name("butterfly").read_bytes() == data
@@ -1,5 +1,7 @@
 """Test the shocks module."""
 
+import pytest
+
 from kala.models.graphs import get_neighbours
 from kala.models.shocks import (
     AddEdge,
@@ -42,80 +44,58 @@ def test_remove_player(fixture_game_state):
     assert get_neighbours(agents[0], game.graph, game.placements) == []
 
 
-def test_remove_random_player(fixture_game_state):
-    """Test the RemoveRandomPlayer shock."""
-    game = fixture_game_state
-
-    RemoveRandomPlayer().apply(game)
-
-    assert game.graph.number_of_nodes() == 6
-    assert len(game.agents) == 5
-
-
-def test_add_edge(fixture_game_state):
-    """Test the AddEdge shock."""
-    game = fixture_game_state
-    agents = game.agents
-
-    a = agents[0]
-    AddEdge(a, agents[-1]).apply(game)
-
-    assert game.graph.number_of_nodes() == 6
-    assert game.graph.number_of_edges() == 8
-
-    assert agents[-1] in get_neighbours(a, game.graph, game.placements)
-
-
-def test_add_random_edge(fixture_game_state):
-    """Test the AddRandomEdge shock."""
-
-    game = fixture_game_state
+# shock, agents passed to the shock, expected agents, expected edges, and the pairs of agents
+# (i, j, is_neighbour) that should be neighbours (or not) after the shock, and the reverse before
+EDGE_SHOCK_CASES = [
+    (AddEdge, (0, 5), 6, 8, [(0, 5, True)]),
+    (RemoveEdge, (2, 3), 6, 6, [(2, 3, False)]),
+    (SwapEdge, (2, 3, 4), 6, 7, [(2, 3, False), (2, 4, True)]),
+]
 
-    AddRandomEdge().apply(game)
 
-    assert game.graph.number_of_nodes() == 6
-    assert game.graph.number_of_edges() == 8
-
-
-def test_remove_edge(fixture_game_state):
-    """Test the RemoveEdge shock."""
+@pytest.mark.parametrize(
+    "shock_cls, indices, expected_agents, expected_edges, pairs", EDGE_SHOCK_CASES
+)
+def test_edge_shock(fixture_game_state, shock_cls, indices, expected_agents, expected_edges, pairs):
+    """Test the AddEdge, RemoveEdge and SwapEdge shocks."""
     game = fixture_game_state
-    agents = game.agents
+    agents = list(game.agents)
 
-    RemoveEdge(agents[2], agents[3]).apply(game)
+    def are_neighbours(i, j):
+        return agents[j] in get_neighbours(agents[i], game.graph, game.placements)
 
-    assert game.graph.number_of_nodes() == 6
-    assert game.graph.number_of_edges() == 6
-    assert agents[3] not in get_neighbours(agents[2], game.graph, game.placements)
-
-
-def test_remove_random_edge(fixture_game_state):
-    """Test the RemoveRandomEdge shock."""
-    game = fixture_game_state
+    assert all(are_neighbours(i, j) is not is_neighbour for i, j, is_neighbour in pairs)
 
-    RemoveRandomEdge().apply(game)
+    shock_cls(*(agents[i] for i in indices)).apply(game)
 
     assert game.graph.number_of_nodes() == 6
-    assert game.graph.number_of_edges() == 6
-
-
-def test_swap_edge(fixture_game_state):
-    """Test the SwapEdge shock."""
+    assert len(game.agents) == expected_agents
+    assert game.graph.number_of_edges() == expected_edges
+    assert all(are_neighbours(i, j) is is_neighbour for i, j, is_neighbour in pairs)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize(
+    "shock_cls, expected_agents, expected_edges",
+    [
+        (RemoveRandomPlayer, 5, 7),
+        (AddRandomEdge, 6, 8),
+        (RemoveRandomEdge, 6, 6),
+        (SwapRandomEdge, 6, 7),
+    ],
+)
+def test_random_shock(fixture_game_state, shock_cls, expected_agents, expected_edges, seed):
+    """Test the effect of the random shocks on the number of agents and edges."""
     game = fixture_game_state
-    agents = game.agents
+    other = game.copy()
 
-    SwapEdge(agents[2], agents[3], agents[4]).apply(game)
+    # the shocks are seeded so that the tests are reproducible (and the same draws are made)
+    shock_cls(rng=seed).apply(game)
+    shock_cls(rng=seed).apply(other)
 
     assert game.graph.number_of_nodes() == 6
-    assert game.graph.number_of_edges() == 7
-    assert agents[4] in get_neighbours(agents[2], game.graph, game.placements)
-
+    assert len(game.agents) == expected_agents
+    assert game.graph.number_of_edges() == expected_edges
 
-def test_swap_random_edge(fixture_game_state):
-    """Test the SwapRandomEdge shock."""
-    game = fixture_game_state
-
-    SwapRandomEdge().apply(game)
-
-    assert game.graph.number_of_nodes() == 6
-    assert game.graph.number_of_edges() == 7
+    assert set(game.graph.edges) == set(other.graph.edges)
+    assert [a.uuid for a in game.agents] == [a.uuid for a in other.agents]
@@ -1,39 +1,91 @@
 """Test the strategies module."""
 
+import pickle
+
+import numpy as np
 import pytest
 
 from kala.models.agents import SaverAgent
 from kala.models.strategies import MatchingStrategy, SaverCooperationPayoffStrategy
 
 
-@pytest.fixture
-def agent_pair(fixture_saver_agents):
-    """Return a pair of agents."""
-    # Assuming the first is a saver and the fourth is a non-saver
-    return fixture_saver_agents[0], fixture_saver_agents[3]
+PAY_SS = (1.15, 1.15)
+PAY_SN = (0.9, 1.0)
+PAY_NS = (1.0, 0.9)
+ONES = (1.0, 1.0)
+
+PAYOFFS = [
+    ((True, True), PAY_SS),
+    ((True, False), PAY_SN),
+    ((False, True), PAY_NS),
+    ((False, False), ONES),
+]
+EXPECTED = np.array([payoffs for _, payoffs in PAYOFFS])
+
+
+def _tolerance(strategy):
+    """Absolute tolerance for the payoffs (the stochastic strategies have negligible noise)."""
+    return 1e-2 if strategy.stochastic else 1e-12
 
 
-def test_init_saver_cooperation_payoff_strategy(agent_pair):
+@pytest.fixture(scope="module", params=[True, False], ids=["stochastic", "deterministic"])
+def saver_coop_strategy(request):
+    """Return a cooperation strategy (with negligible noise in the stochastic case)."""
+    return SaverCooperationPayoffStrategy(request.param, dist_sigma_func=lambda x: 1e-6)
+
+
+def test_init_saver_cooperation_payoff_strategy():
     """Test the initialization of a saver cooperation payoff strategy."""
-    saver, non_saver = agent_pair
+    assert SaverCooperationPayoffStrategy().stochastic  # stochastic=True by default
+
+
+@pytest.fixture(scope="module")
+def payoff_matches(fixture_agent_pair):
+    """Return a match for each row of PAYOFFS."""
+    saver, non_saver = fixture_agent_pair
+    return [[saver if s else non_saver for s in savers] for savers, _ in PAYOFFS]
 
-    strategy = SaverCooperationPayoffStrategy(dist_sigma_func=lambda x: 1e-6)
-    pay_ss, pay_sn = 1.15, 0.9
-    assert strategy.stochastic  # stochastic=True by default
 
-    assert strategy.calculate_payoff([saver, saver]) == pytest.approx([pay_ss, pay_ss], rel=1e-2)
-    assert strategy.calculate_payoff([saver, non_saver]) == pytest.approx([pay_sn, 1.0], rel=1e-2)
-    assert strategy.calculate_payoff([non_saver, saver]) == pytest.approx([1.0, pay_sn], rel=1e-2)
-    assert strategy.calculate_payoff([non_saver, non_saver]) == pytest.approx([1.0, 1.0])
+def test_saver_cooperation_payoff(saver_coop_strategy, payoff_matches):
+    """Test the payoff of each combination of savers and non-savers."""
+    payoffs = np.array([saver_coop_strategy.calculate_payoff(m) for m in payoff_matches])
+    assert np.allclose(payoffs, EXPECTED, rtol=0, atol=_tolerance(saver_coop_strategy))
 
 
-def test_matching_strategy(fixture_agent_placement, fixture_networkx_graph):
+def test_matching_strategy(fixture_base_game_state):
     """Test the matching strategy."""
+    game = fixture_base_game_state  # only read (the matching does not modify the game)
     strategy = MatchingStrategy()
-    matches = strategy.select_matches(fixture_agent_placement, fixture_networkx_graph)
+    matches = strategy.select_matches(game.placements, game.graph)
+
+    assert len(matches) == game.graph.number_of_nodes() // 2
+    assert all(len(match) == 2 for match in matches)
+    assert all(isinstance(a, SaverAgent) and isinstance(b, SaverAgent) for a, b in matches)
+
+
+def test_calculate_payoffs(saver_coop_strategy, payoff_matches):
+    """Test that a batch of matches gives the same payoffs as the matches played one by one."""
+    payoffs = saver_coop_strategy.calculate_payoffs(payoff_matches)
+    assert np.allclose(payoffs, EXPECTED, rtol=0, atol=_tolerance(saver_coop_strategy))
+    assert saver_coop_strategy.calculate_payoffs([]).shape == (0, 2)
+
+
+def test_pickle_saver_cooperation_payoff_strategy(saver_coop_strategy, payoff_matches):
+    """Test that a strategy can be pickled (e.g. to send a game to another process)."""
+    strategy = pickle.loads(pickle.dumps(saver_coop_strategy))
+    payoffs = np.array([strategy.calculate_payoff(m) for m in payoff_matches])
+    assert np.allclose(payoffs, EXPECTED, rtol=0, atol=_tolerance(strategy))
+
+
+def test_payoff_matrix_update(payoff_matches):
+    """Test that the payoff matrix is read-only and that assigning a new one updates the payoffs."""
+    strategy = SaverCooperationPayoffStrategy(stochastic=False)
+    with pytest.raises(TypeError):
+        strategy.payoff_matrix[("saver", "saver")] = (5.0, 5.0)  # type: ignore[index]
 
-    assert len(matches) == fixture_networkx_graph.number_of_nodes() // 2
-    for match in matches:
-        assert len(match) == 2
-        assert isinstance(match[0], SaverAgent)
-        assert isinstance(match[1], SaverAgent)
+    strategy.payoff_matrix = {**strategy.payoff_matrix, ("saver", "saver"): (5.0, 5.0)}
+    assert strategy.calculate_payoff(payoff_matches[0]) == [5.0, 5.0]
+    assert strategy.calculate_payoffs(payoff_matches).tolist() == [
+        [5.0, 5.0],
+        *EXPECTED[1:].tolist(),
+    ]